@@ -1,36 +1,23 @@
 import subprocess
 import sys
-import os
-import re
 
 
-def get_package_name_from_wheel(wheel_file):
-    # Extract the package name from the wheel filename
-    basename = os.path.basename(wheel_file)
-    package_name = re.split(r"[-_]", basename)[0]
-    return package_name
+def install_package_from_wheel(wheel_file, no_deps=False):
+    # --force-reinstall uninstalls the currently installed version itself, no separate uninstall needed
+    command = [sys.executable, '-m', 'pip', 'install', '--force-reinstall', wheel_file]
+    if no_deps:
+        # skip reinstalling dependencies when only the package itself changed
+        command.append('--no-deps')
 
-
-def uninstall_package(package_name):
-    try:
-        subprocess.check_call([sys.executable, '-m', 'pip', 'uninstall', '-y', package_name])
-        print(f"Successfully uninstalled {package_name}")
-    except subprocess.CalledProcessError:
-        print(f"Failed to uninstall {package_name} or package not installed")
-
-
-def install_package_from_wheel(wheel_file):
     try:
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '--force-reinstall', wheel_file])
+        subprocess.check_call(command)
         print(f"Successfully installed package from {wheel_file}")
     except subprocess.CalledProcessError:
         print(f"Failed to install package from {wheel_file}")
 
 
-def main(wheel_file):
-    package_name = get_package_name_from_wheel(wheel_file)
-    uninstall_package(package_name)
-    install_package_from_wheel(wheel_file)
+def main(wheel_file, no_deps=False):
+    install_package_from_wheel(wheel_file, no_deps=no_deps)
 
 
 if __name__ == "__main__":
@@ -1,27 +1,89 @@
 import logging
+import threading
+import time
+from typing import Literal
 
-from cachetools import TTLCache, cached
-from azure.identity import DefaultAzureCredential
+from azure.core.credentials import AccessToken, TokenCredential
+from azure.identity import (
+    ChainedTokenCredential,
+    DefaultAzureCredential,
+    EnvironmentCredential,
+    ManagedIdentityCredential,
+)
+from pydantic_settings import BaseSettings
 
 from src.api.settings import EnvironmentSettings
 
 _logger = logging.getLogger()
 environment_settings = EnvironmentSettings()
 
-# 5 minute cache
-cache = TTLCache(maxsize=100, ttl=300)
+
+class AzureCredentialSettings(BaseSettings):
+    """
+    Selects the credential used for Azure access tokens.
+    default: DefaultAzureCredential, probes every credential source (local development)
+    managed: ManagedIdentityCredential only (production)
+    chained: ManagedIdentityCredential, then EnvironmentCredential
+    """
+    azure_credential_mode: Literal['default', 'managed', 'chained'] = 'default'
+
+
+credential_settings = AzureCredentialSettings()
+
+# tokens are reused until they are within this many seconds of expiring
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+# scope -> most recently issued token
+_TOKEN_CACHE: dict[str, AccessToken] = {}
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+# process-wide credential, DefaultAzureCredential probes its credential chain on construction
+_CREDENTIAL: TokenCredential | None = None
+
+
+def _create_credential() -> TokenCredential:
+    mode = credential_settings.azure_credential_mode
+    if mode == 'managed':
+        return ManagedIdentityCredential(client_id=environment_settings.azure_client_id)
+    if mode == 'chained':
+        return ChainedTokenCredential(
+            ManagedIdentityCredential(client_id=environment_settings.azure_client_id),
+            EnvironmentCredential()
+        )
+    return DefaultAzureCredential()
+
+
+def get_credential() -> TokenCredential:
+    global _CREDENTIAL
+    if _CREDENTIAL is None:
+        _CREDENTIAL = _create_credential()
+    return _CREDENTIAL
+
+
+def _is_token_valid(token: AccessToken | None) -> bool:
+    return token is not None and token.expires_on - time.time() > TOKEN_REFRESH_MARGIN_SECONDS
 
 
-@cached(cache)
 def get_access_token(scope: str) -> str:
-    try:
-        _logger.info(
-            f"Requesting managed identity access for scope: {scope} and with identity: {environment_settings.azure_client_id}")
-        credential = DefaultAzureCredential()
-        token = credential.get_token(scope)
-        access_token = token.token
-        _logger.info(f"Managed identity access token received")
-        return access_token
-    except Exception as e:
-        _logger.exception("error retrieving managed identity access token", exc_info=e)
-        raise e
+    token = _TOKEN_CACHE.get(scope)
+    if _is_token_valid(token):
+        return token.token
+
+    with _TOKEN_CACHE_LOCK:
+        # another thread may have refreshed the token while we waited on the lock
+        token = _TOKEN_CACHE.get(scope)
+        if _is_token_valid(token):
+            return token.token
+
+        try:
+            _logger.info(
+                "Requesting managed identity access for scope: %s and with identity: %s",
+                scope, environment_settings.azure_client_id)
+            credential = get_credential()
+            token = credential.get_token(scope)
+            _TOKEN_CACHE[scope] = token
+            _logger.info("Managed identity access token received")
+            return token.token
+        except Exception as e:
+            _logger.exception("error retrieving managed identity access token", exc_info=e)
+            raise e
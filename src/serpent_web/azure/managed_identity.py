@@ -1,34 +1,79 @@
+import warnings
+
 import requests
+from requests.adapters import HTTPAdapter
 
 from serpent_web.azure.azure_service_identity import get_access_token
 
+# pooled sessions shared by every RequestSessionService for the same scope
+_SESSIONS: dict[str, requests.Session] = {}
+
+
+def _get_session(scope: str) -> requests.Session:
+    session = _SESSIONS.get(scope)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_maxsize=32))
+        session = _SESSIONS.setdefault(scope, session)
+    return session
 
-# def get_identity_request_session():
-#     session = requests.Session()
-#
-#     session.headers.update({
-#         "Content-Type": "application/json"
-#     })
-#
-#     access_token =
-#
 
 class RequestSessionService:
+    """
+    Sends requests through a connection-pooled session shared per scope.
+    Headers (including the bearer token) are attached to each request rather than
+    to the shared session, so instances never affect one another.
+    Send requests with request / get / post / put / patch / delete, e.g. RequestSessionService(scope).get(url).
+    The session attribute is deprecated: the shared session carries no headers, so it returns a session of the
+    instance's own that does, reusing the shared connection pool.
+    """
     def __init__(self, scope: str, bypass_token: bool = False, custom_headers: dict = None):
         self.scope = scope
         self.bypass_token = bypass_token
-        self.session = requests.Session()
+        self._session = _get_session(scope)
+        self._legacy_session: requests.Session | None = None
         self._set_headers(custom_headers)
 
+    @property
+    def session(self) -> requests.Session:
+        warnings.warn(
+            "RequestSessionService.session is deprecated, use request / get / post / put / patch / delete instead",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        if self._legacy_session is None:
+            session = requests.Session()
+            session.mount("https://", self._session.get_adapter("https://"))
+            session.headers.update(self.headers)
+            self._legacy_session = session
+        return self._legacy_session
+
     def _set_headers(self, custom_headers: dict | None):
-        custom_headers = custom_headers or {}
-        if custom_headers.get("Content-Type", False):
-            self.session.headers.update({
-                "Content-Type": "application/json"
-            })
+        # JSON content type by default, caller provided headers take precedence
+        headers = {"Content-Type": "application/json"}
+        if custom_headers:
+            headers.update(custom_headers)
 
         if not self.bypass_token:
-            access_token = get_access_token(self.scope)
-            self.session.headers.update({
-                "Authorization": f"Bearer {access_token}"
-            })
+            headers["Authorization"] = f"Bearer {get_access_token(self.scope)}"
+
+        self.headers = headers
+
+    def request(self, method: str, url: str, headers: dict = None, **kwargs) -> requests.Response:
+        request_headers = {**self.headers, **headers} if headers else self.headers
+        return self._session.request(method, url, headers=request_headers, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
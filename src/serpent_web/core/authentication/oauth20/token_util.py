@@ -1,58 +1,269 @@
+import base64
+import hashlib
+import json
 import logging
+import threading
+import time
+from functools import lru_cache
 
-from cachetools import TTLCache, cached
 import requests
-from jose import jwt
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from jose import jwk, jwt
+from jose.backends.base import Key
+from pydantic_settings import BaseSettings
 from starlette.exceptions import HTTPException
 from jsonpath_ng import parse
 
+try:
+    # optional, faster parsing of JWKS responses and token headers
+    import orjson as _json
+except ImportError:
+    _json = json
+
 _logger = logging.getLogger(__name__)
 
 RSAA = "RS256"
 
-# Cache for JWKS keys
-cache = TTLCache(maxsize=100, ttl=600)
+# the only signing algorithms accepted for tokens, pinned so a token cannot choose a weaker algorithm (e.g. "none")
+_ALG_WHITELIST = (RSAA,)
+
+
+class TokenVerificationSettings(BaseSettings):
+    """
+    token_verify_cache_enabled: reuse the payload of a recently verified token instead of verifying its signature
+    again, for token_verify_cache_ttl_seconds. Off by default: a cached token stays accepted for the ttl even if
+    its signing key is revoked in the meantime.
+    """
+    token_verify_cache_enabled: bool = False
+    token_verify_cache_ttl_seconds: float = 5
+    token_verify_cache_maxsize: int = 10_000
+
+
+token_settings = TokenVerificationSettings()
+
+# (sha256(token), jwks_url, audience) -> verified payload, keyed by digest to bound the memory per entry
+_verify_cache = TTLCache(
+    maxsize=token_settings.token_verify_cache_maxsize,
+    ttl=token_settings.token_verify_cache_ttl_seconds
+)
+_verify_cache_lock = threading.Lock()
+
+# Cache for JWKS keys: {jwks_url: ({kid: key}, expires_at)}
+# entries are refetched after JWKS_CACHE_TTL_SECONDS (revoked keys drop out) or when a token references
+# an unknown kid (key rotation)
+_jwks_cache: dict[str, tuple[dict, float]] = {}
+# one lock per JWKS endpoint: concurrent misses for an endpoint wait for a single fetch,
+# fetches for different endpoints don't block each other
+_jwks_fetch_locks: dict[str, threading.Lock] = {}
+
+JWKS_CACHE_TTL_SECONDS = 300
+# cached keys are not refetched (even when a refresh is requested) within this many seconds of the last fetch,
+# so tokens with unknown key ids, which anyone can forge, cannot make every request fetch the JWKS
+JWKS_MIN_REFETCH_INTERVAL_SECONDS = 30
+# monotonic time of the last fetch (attempt) per JWKS endpoint
+_jwks_fetched_at: dict[str, float] = {}
+# a cache hit in the last part of the ttl refreshes the keys in the background, so requests don't wait on the fetch
+JWKS_REFRESH_AHEAD_SECONDS = JWKS_CACHE_TTL_SECONDS * 0.2
+# JWKS endpoints with a background refresh in flight
+_jwks_refreshing: set[str] = set()
+_jwks_refreshing_lock = threading.Lock()
+
+# (jwks_url, kid) -> (jwk, key constructed from it), constructing the key is the costly part of using a JWK
+# an entry is only used while its jwk is the one currently cached for the kid, a JWKS refetch replaces it
+_verification_keys: dict[tuple[str, str], tuple[dict, Key]] = {}
+_verification_keys_lock = threading.Lock()
+VERIFICATION_KEY_CACHE_MAXSIZE = 500
+
+# pooled keep-alive session so JWKS refreshes reuse the TLS connection
+_jwks_session = requests.Session()
+_jwks_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# (connect, read) timeouts, a connect attempt to an unreachable endpoint fails fast
+JWKS_REQUEST_TIMEOUT_SECONDS = (3, 5)
 
 
-@cached(cache)
-def get_jwks_keys(jwks_url):
+def get_jwks_keys(jwks_url, refresh: bool = False):
+    """
+    Return the JWKS keys for the JWKS endpoint, fetching them when not cached, expired or when refresh is requested.
+    Cached keys are returned without fetching within JWKS_MIN_REFETCH_INTERVAL_SECONDS of the last fetch.
+    If fetching expired keys fails, the expired keys are returned.
+    """
+    entry = _jwks_cache.get(jwks_url)
+    if entry is not None and not refresh:
+        remaining = entry[1] - time.monotonic()
+        if remaining > 0:
+            if remaining < JWKS_REFRESH_AHEAD_SECONDS and _can_refetch_jwks(jwks_url, time.monotonic()):
+                _start_jwks_refresh(jwks_url)
+            return entry[0]
+
+    with _jwks_fetch_locks.setdefault(jwks_url, threading.Lock()):
+        # another thread may have refreshed the cache while we waited on the lock
+        cached_entry = _jwks_cache.get(jwks_url)
+        now = time.monotonic()
+        if cached_entry is not None and cached_entry is not entry and cached_entry[1] > now:
+            return cached_entry[0]
+        if cached_entry is not None and not _can_refetch_jwks(jwks_url, now):
+            return cached_entry[0]
+
+        _jwks_fetched_at[jwks_url] = now
+        try:
+            keys = _fetch_jwks_keys(jwks_url)
+        except HTTPException:
+            if cached_entry is None or refresh:
+                raise
+            _logger.warning("failed to refresh JWKS keys from: %s, using the expired keys", jwks_url, exc_info=True)
+            return cached_entry[0]
+
+        _jwks_cache[jwks_url] = (keys, time.monotonic() + JWKS_CACHE_TTL_SECONDS)
+        return keys
+
+
+def _can_refetch_jwks(jwks_url, now: float) -> bool:
+    return now - _jwks_fetched_at.get(jwks_url, float("-inf")) >= JWKS_MIN_REFETCH_INTERVAL_SECONDS
+
+
+def _start_jwks_refresh(jwks_url) -> None:
+    """Refresh the JWKS keys of the endpoint in a background thread, unless a refresh is already in flight."""
+    with _jwks_refreshing_lock:
+        if jwks_url in _jwks_refreshing:
+            return
+        _jwks_refreshing.add(jwks_url)
+    threading.Thread(target=_refresh_jwks_keys, args=(jwks_url,), daemon=True).start()
+
+
+def _refresh_jwks_keys(jwks_url) -> None:
+    try:
+        get_jwks_keys(jwks_url, refresh=True)
+    except HTTPException:
+        # the cached keys are used until they expire, the next request after that fetches them again
+        _logger.warning("background refresh of JWKS keys from: %s failed", jwks_url, exc_info=True)
+    finally:
+        with _jwks_refreshing_lock:
+            _jwks_refreshing.discard(jwks_url)
+
+
+def invalidate_jwks(jwks_url: str = None) -> None:
+    """Drop the cached JWKS keys of the JWKS endpoint, or of all endpoints, so they are fetched on next use."""
+    if jwks_url is None:
+        _jwks_cache.clear()
+    else:
+        _jwks_cache.pop(jwks_url, None)
+    with _verification_keys_lock:
+        for cache_key in [cache_key for cache_key in _verification_keys if jwks_url in (None, cache_key[0])]:
+            del _verification_keys[cache_key]
+
+
+def _fetch_jwks_keys(jwks_url):
     """Fetch JWKS keys from the JWKS endpoint."""
     try:
-        _logger.info(f"fetching JWKS keys for cache from: {jwks_url}")
-        resp = requests.get(jwks_url)
+        _logger.info("fetching JWKS keys for cache from: %s", jwks_url)
+        resp = _jwks_session.get(jwks_url, timeout=JWKS_REQUEST_TIMEOUT_SECONDS)
         resp.raise_for_status()
-        jwks = resp.json()
+        jwks = _json.loads(resp.content)
         return {key["kid"]: key for key in jwks["keys"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to fetch JWKS keys.") from e
 
 
+def _peek_header(token) -> dict:
+    """
+    Decode the (unverified) header of a JWT. Only the header segment is decoded,
+    jwt.get_unverified_header decodes the payload and signature as well.
+    """
+    try:
+        if isinstance(token, str):
+            token = token.encode()
+        header_segment = token.split(b".", 1)[0]
+        header = _json.loads(base64.urlsafe_b64decode(header_segment + b"=" * (-len(header_segment) % 4)))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=403, detail="Invalid token headers.") from e
+    if not isinstance(header, dict):
+        raise HTTPException(status_code=403, detail="Invalid token headers.")
+    return header
+
+
 def get_public_key(token, jwks_url):
     """Retrieve the public key for a given JWT token from the JWKS endpoint."""
+    kid = _peek_header(token).get("kid")
+    if not isinstance(kid, str):
+        # rejected without looking up (and possibly fetching) the JWKS keys
+        raise HTTPException(status_code=403, detail="Invalid token headers.")
+    return _get_public_key_by_kid(jwks_url, kid)
+
+
+def _get_public_key_by_kid(jwks_url, kid) -> dict:
     try:
-        unverified_header = jwt.get_unverified_header(token)
-        kid = unverified_header.get("kid")
         keys = get_jwks_keys(jwks_url)
         if kid not in keys:
-            raise HTTPException(status_code=403, detail="Public key not found for the given token.")
-        return keys.get(kid)
-    except jwt.JWTError as e:
-        raise HTTPException(status_code=403, detail="Invalid token headers.") from e
+            # unknown kid, the signing keys may have been rotated - refetch once
+            keys = get_jwks_keys(jwks_url, refresh=True)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error processing token.") from e
 
+    if kid not in keys:
+        raise HTTPException(status_code=403, detail="Public key not found for the given token.")
+    return keys[kid]
+
+
+def _get_verification_key(jwks_url: str, public_key: dict) -> Key:
+    """The key object for a JWK, constructed once per JWKS fetch rather than on every decode."""
+    cache_key = (jwks_url, public_key.get("kid"))
+    entry = _verification_keys.get(cache_key)
+    if entry is not None and entry[0] is public_key:
+        return entry[1]
+
+    key = jwk.construct(public_key, algorithm=public_key.get("alg", RSAA))
+    with _verification_keys_lock:
+        if cache_key not in _verification_keys and len(_verification_keys) >= VERIFICATION_KEY_CACHE_MAXSIZE:
+            # evict the oldest entry
+            del _verification_keys[next(iter(_verification_keys))]
+        _verification_keys[cache_key] = (public_key, key)
+    return key
+
+
+def _decode_token(token, jwks_url: str, audience: str) -> dict:
+    public_key = get_public_key(token=token, jwks_url=jwks_url)
+    verification_key = _get_verification_key(jwks_url, public_key)
+    return jwt.decode(token, verification_key, algorithms=_ALG_WHITELIST, audience=audience)
+
+
+def _get_verified_payload(cache_key) -> dict | None:
+    with _verify_cache_lock:
+        data = _verify_cache.get(cache_key)
+    if data is None:
+        return None
+    exp = data.get("exp")
+    if exp is not None and exp <= time.time():
+        # cached payload outlived the token, verify again so the expiry is handled
+        return None
+    return data
+
 
 def verify_token(token, jwks_url: str, audience: str):
     """Verify the JWT token."""
     if not token:
         raise HTTPException(status_code=403, detail="Access Token is missing")
 
+    cache_key = None
+    # only encoded tokens are cached, anything else (e.g. the refresh_token result) fails verification below
+    if token_settings.token_verify_cache_enabled and isinstance(token, (str, bytes)):
+        token_bytes = token if isinstance(token, bytes) else token.encode()
+        cache_key = (hashlib.sha256(token_bytes).digest(), jwks_url, audience)
+        data = _get_verified_payload(cache_key)
+        if data is not None:
+            return dict(data)
+
     try:
-        public_key = get_public_key(token=token, jwks_url=jwks_url)
-        data = jwt.decode(token, public_key, algorithms=[RSAA], audience=audience)
+        data = _decode_token(token, jwks_url, audience)
         # Token is valid
+        if cache_key is not None:
+            with _verify_cache_lock:
+                _verify_cache[cache_key] = data
 
-        return data
+        return dict(data)
 
     except jwt.JWTClaimsError:
         raise HTTPException(status_code=403, detail="Claims verification failed.")
@@ -63,18 +274,38 @@ def verify_token(token, jwks_url: str, audience: str):
         raise HTTPException(status_code=403, detail="Token is invalid.") from e
 
 
+@lru_cache(maxsize=256)
+def _parse_json_path(claim_json_path: str):
+    return parse(claim_json_path)
+
+
+@lru_cache(maxsize=256)
+def _split_claim_path(claim_json_path: str) -> tuple[str, ...] | None:
+    """The segments of a dotted claim path, e.g. "user.name", or None if it needs JSONPath (e.g. "roles[0]")."""
+    segments = tuple(claim_json_path.split('.'))
+    return segments if all(segment.isidentifier() for segment in segments) else None
+
+
 def get_claim_from_payload(payload: dict, claim_json_path: str) -> str | None:
     """
     Extract a specified claim from a JWT payload using JSONPath.
 
     :param payload: The JWT payload (decoded token).
     :param claim_json_path: The JSONPath string specifying the claim to extract. Ex: "uid" or for a nested claim "user.name"
-    :return: The extracted claim value.
+    :return: The extracted claim value, or None if the claim is not present.
     """
-    jsonpath_expression = parse(claim_json_path)
+    # plain (dotted) claim names, the common case, are looked up directly without a JSONPath expression
+    segments = _split_claim_path(claim_json_path)
+    if segments is not None:
+        value = payload
+        for segment in segments:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(segment)
+        return value
 
-    matches = jsonpath_expression.find(payload)
-    return matches[0].value
+    matches = _parse_json_path(claim_json_path).find(payload)
+    return matches[0].value if matches else None
 
 
 # TODO - implement refresh for oauth 2.0
@@ -1,5 +1,9 @@
 from datetime import datetime, timezone
 
+# bound once, utc_now_time_aware is the default / onupdate of every model timestamp
+_UTC = timezone.utc
+_now = datetime.now
+
 
 def utc_now_time_aware() -> datetime:
-    return datetime.now(timezone.utc)
+    return _now(_UTC)
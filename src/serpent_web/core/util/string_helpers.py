@@ -1,49 +1,40 @@
 import re
+from functools import lru_cache
 
+# word boundaries: lower/digit -> upper ("fooBar") and the end of an acronym ("HTTPResponse")
+_TITLE_TO_SNAKE_RE = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
 
+
+@lru_cache(maxsize=2048)
 def snake_to_pascal(string: str) -> str:
     """
     Example: "foo_bar" -> "FooBar"
     :param string:
     :return:
     """
-    string_array = string.split('_')
-    result = []
-    for word in string_array:
-        result.append(word.capitalize())
-    return ''.join(result)
+    return ''.join([word.capitalize() for word in string.split('_')])
 
 
-def snake_to_title(string: str) -> str:
-    """
-    Example: "foo_bar" -> "FooBar"
-    :param string:
-    :return:
-    """
-    return snake_to_pascal(string)
+# alias - identical output to snake_to_pascal
+snake_to_title = snake_to_pascal
 
 
+@lru_cache(maxsize=2048)
 def snake_to_camel(string: str) -> str:
     """
     Example: "foo_bar" -> "fooBar"
     :param string:
     :return:
     """
-    string_array = string.split('_')
-    result = []
-    for idx, word in enumerate(string_array):
-        if idx == 0:
-            result.append(word.lower())
-        else:
-            result.append(word.capitalize())
-
-    return ''.join(result)
+    first, _, rest = string.partition('_')
+    return first.lower() + ''.join([word.capitalize() for word in rest.split('_')])
 
 
+@lru_cache(maxsize=2048)
 def title_to_snake(string: str) -> str:
     """
-    Example: "FooBar" -> "foo_bar"
+    Example: "FooBar" -> "foo_bar", "HTTPResponse" -> "http_response"
     :param string:
     :return:
     """
-    return re.sub(r'(?<!^)(?=[A-Z])', '_', string).lower()
+    return _TITLE_TO_SNAKE_RE.sub('_', string).lower()
@@ -1,6 +1,7 @@
 from azure.cosmos import CosmosClient, DatabaseProxy, ContainerProxy
-from typing import Optional, Any
-from azure.identity import DefaultAzureCredential
+from typing import Optional, Any, Iterable
+
+from serpent_web.azure.azure_service_identity import get_credential
 
 from src.api.shared.settings import CosmosSettingsModel
 
@@ -8,16 +9,18 @@ class CosmosClientContext:
     _settings: CosmosSettingsModel
     _client: CosmosClient
     _database: DatabaseProxy
-    _container: ContainerProxy
+    _containers: dict[str, ContainerProxy]
 
     def __init__(self, settings: CosmosSettingsModel, client: CosmosClient = None ):
         self._settings = settings
         self._client = client
+        self._database = None
+        self._containers = {}
     
     def _get_client(self) -> CosmosClient:
         if self._client is None:
             if self._settings.use_rbac:
-                rbac_credentials = DefaultAzureCredential()
+                rbac_credentials = get_credential()
                 self._client = CosmosClient(url = self._settings.account_uri, credential=rbac_credentials)
             else:
                 self._client = CosmosClient(url = self._settings.account_uri, credential= self._settings.account_key)
@@ -25,9 +28,11 @@ class CosmosClientContext:
         return self._client
     
     def _get_container(self, container_name: str) -> ContainerProxy:
-        client = self._get_client()
-        database = client.get_database_client(database=self._settings.database_name)
-        container = database.get_container_client(container=container_name)
+        container = self._containers.get(container_name)
+        if container is None:
+            container = self._get_database().get_container_client(container=container_name)
+            self._containers[container_name] = container
+
         return container
     
     def _get_database(self) -> DatabaseProxy:
@@ -69,8 +74,12 @@ class CosmosClientContext:
             partition_key_val: str,
             parameters: Optional[list[dict[str, object]]] = None,
             max_item_count: int = -1,
-            token: str = None ) -> list[dict[str, Any]]:
-        
+            token: str = None ) -> Iterable[dict[str, Any]]:
+        """
+            Query items in Cosmos DB.
+            Results are returned lazily - pages are fetched from Cosmos DB as the iterable is consumed.
+            Use query_items_list when the full result set is needed as a list.
+        """
         if not container_name:
             raise ValueError('container_name must be specified')
         if not partition_key_val:
@@ -84,7 +93,24 @@ class CosmosClientContext:
             partition_key=partition_key_val,
             parameters=parameters,
             max_item_count=max_item_count)
-        
-        items = list(query_iterable)
-        
-        return items
+
+        return query_iterable
+
+    def query_items_list(
+            self,
+            container_name: str,
+            query: str,
+            partition_key_val: str,
+            parameters: Optional[list[dict[str, object]]] = None,
+            max_item_count: int = -1,
+            token: str = None ) -> list[dict[str, Any]]:
+        """
+            Query items in Cosmos DB and materialize all pages into a list.
+        """
+        return list(self.query_items(
+            container_name=container_name,
+            query=query,
+            partition_key_val=partition_key_val,
+            parameters=parameters,
+            max_item_count=max_item_count,
+            token=token))
@@ -1,17 +1,18 @@
 from typing import TypeVar, Generic, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 TModel = TypeVar('TModel')
 
 
 class PaginatedList(BaseModel, Generic[TModel]):
-    total: int
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    total: Optional[int]
     skip: int
     limit: int
     data: list[TModel]
     next: Optional[int]
     previous: Optional[int]
-
-    class Config:
-        arbitrary_types_allowed = True
+    # opaque keyset pagination token for the next page, only set for cursor paginated requests
+    next_cursor: Optional[str] = None
@@ -1,10 +1,16 @@
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from serpent_web.core.util.string_helpers import snake_to_camel
+
+_MISSING = object()
 
 
 class BaseSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: Optional[UUID] = Field(default=None)
 
     @field_validator("id")
@@ -18,5 +24,26 @@ class BaseSchema(BaseModel):
     def pk(self) -> UUID:
         return self.id
 
-    class Config:
-        orm_mode = True
+    @classmethod
+    def from_trusted(cls, obj):
+        """
+        Build the schema from an ORM model (or any object with matching attributes) without validation.
+        Only for data that is already valid, e.g. rows read from the database: no validators run and
+        nested objects are not converted to their schemas. Use model_validate for anything else.
+        :param obj: The object to read the field values from
+        :return: The schema
+        """
+        values = {}
+        for name in cls.model_fields:
+            value = getattr(obj, name, _MISSING)
+            if value is not _MISSING:
+                values[name] = value
+        return cls.model_construct(**values)
+
+
+class CamelCaseSchema(BaseSchema):
+    """
+    BaseSchema with camelCase aliases, e.g. created_on <-> createdOn. Snake case field names are accepted as input
+    too. FastAPI serializes response models by alias, so responses of these schemas use the camelCase keys.
+    """
+    model_config = ConfigDict(alias_generator=snake_to_camel, populate_by_name=True)
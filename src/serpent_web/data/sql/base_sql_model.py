@@ -2,12 +2,12 @@ from abc import ABC, abstractmethod
 from abc import ABCMeta
 from typing import TypeVar, Generic
 
-from sqlalchemy import Column, event
+from sqlalchemy import Column
 from sqlalchemy.orm import declared_attr, as_declarative, DeclarativeMeta, Mapped
 from sqlalchemy.types import TIMESTAMP
 
 from serpent_web.core.util.datetime_helpers import utc_now_time_aware
-from serpent_web.core.util.string_helpers import snake_to_camel, title_to_snake
+from serpent_web.core.util.string_helpers import title_to_snake
 
 TId = TypeVar('TId', bound=object)
 
@@ -46,12 +46,3 @@ class BaseSqlModel(Generic[TId], ABC):
     @abstractmethod
     def default_id(cls):
         pass
-
-    class Config:
-        alias_generator = snake_to_camel
-
-
-# Event listener to update `updated_on` before update
-@event.listens_for(BaseSqlModel, 'before_update', propagate=True)
-def update_timestamp(mapper, connection, target):
-    target.updated_on = utc_now_time_aware()
@@ -1,11 +1,18 @@
+import base64
+import io
+import json
 import logging
-from typing import TypeVar, Generic, Type, List, Dict, Any, get_args
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from itertools import islice
+from typing import TypeVar, Generic, Type, List, Dict, Any, Iterator, get_args
 from uuid import UUID
 
-from pyexpat import model
-
-from sqlalchemy import String, Text, or_
-from sqlalchemy.orm import Session, RelationshipProperty
+from sqlalchemy import Select, String, Text, and_, bindparam, case, delete, func, insert, inspect, literal, or_, select, tuple_, update
+from sqlalchemy.orm import MANYTOONE, Session, contains_eager, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 
 from serpent_web.data.data_schemas import PaginatedList
 from serpent_web.data.sql.base_sql_model import BaseSqlModel
@@ -14,16 +21,222 @@ _logger = logging.getLogger(__name__)
 
 TModel = TypeVar('TModel', bound=BaseSqlModel)  # orm model
 
+# maximum number of parameters bound into a single IN (...) clause
+IN_CLAUSE_BATCH_SIZE = 1000
+
+# rows per executemany / multi-row INSERT in create_many
+INSERT_BATCH_SIZE = 1000
+
+# rows fetched per round trip (and yielded per batch) by iter_all
+ITER_BATCH_SIZE = 1000
+
+# minimum number of rows for create_many(use_copy=True) to use PostgreSQL COPY instead of INSERT
+COPY_THRESHOLD = 100
+
+# column python types whose (bind processed) values are written as valid COPY text input by _to_copy_text,
+# unlike e.g. ARRAY or JSON values
+_COPY_TEXT_TYPES = (str, int, float, Decimal, bool, UUID, datetime, date, time, bytes, Enum)
+
+# dialects supporting row value comparisons, e.g. (a, b) > (1, 2), used by keyset pagination (not SQL Server)
+ROW_VALUE_DIALECTS = frozenset({"postgresql", "sqlite", "mysql"})
+
+
+@lru_cache(maxsize=None)
+def _get_column_map(model: type[BaseSqlModel]) -> dict[str, Any]:
+    """Map of attribute name -> mapped column attribute, computed once per model class."""
+    return {attr.key: getattr(model, attr.key) for attr in model.__mapper__.column_attrs}
+
+
+@lru_cache(maxsize=None)
+def _get_relationship_map(model: type[BaseSqlModel]) -> dict[str, tuple[Any, type]]:
+    """Map of relationship name -> (relationship attribute, related model class), computed once per model class."""
+    return {rel.key: (getattr(model, rel.key), rel.mapper.class_) for rel in model.__mapper__.relationships}
+
+
+@lru_cache(maxsize=1024)
+def _resolve_field_path(model: type[BaseSqlModel], field_name: str) -> tuple[Any, tuple]:
+    """
+    Resolve a (dotted) field name to its column and the relationship attributes to join, e.g.
+    'owner.name' -> (Owner.name, (Pet.owner,)). Cached per model and field name.
+    """
+    current_model = model
+    joins = []
+    column = None
+    for part in field_name.split('.'):
+        relationship = _get_relationship_map(current_model).get(part)
+        if relationship is not None:
+            # It's a relationship
+            attr, current_model = relationship
+            joins.append(attr)
+            continue
+
+        # It's a column
+        column = _get_column_map(current_model).get(part)
+        if column is None:
+            raise AttributeError(f"'{current_model.__name__}' has no attribute '{part}'")
+    if column is None:
+        raise AttributeError(f"Field '{field_name}' does not correspond to a valid column")
+    return column, tuple(joins)
+
+
+@lru_cache(maxsize=1024)
+def _resolve_order_by(model: type[BaseSqlModel], field_name: str):
+    """Resolve an order_by field name ('-' prefix for descending) to its order criterion. Cached per model."""
+    descending = field_name.startswith('-')
+    if descending:
+        field_name = field_name[1:]
+    field = _get_column_map(model).get(field_name)
+    if field is None:
+        raise AttributeError(f"'{model.__name__}' has no attribute '{field_name}'")
+    return field.desc() if descending else field.asc()
+
+
+@lru_cache(maxsize=1024)
+def _build_lookup_stmt(model: type[BaseSqlModel], keys: tuple[str, ...]) -> Select:
+    """
+    Select of the model filtered by equality on each key, with the values as bound parameters named after the keys.
+    Built once per model and key set: reusing the statement object skips its construction and cache key generation.
+    """
+    columns = _get_column_map(model)
+    conditions = []
+    for key in keys:
+        column = columns.get(key)
+        if column is None:
+            raise AttributeError(f"'{model.__name__}' has no attribute '{key}'")
+        conditions.append(column == bindparam(key))
+    return select(model).where(*conditions)
+
+
+@lru_cache(maxsize=None)
+def _requires_orm_delete(model: type[BaseSqlModel]) -> bool:
+    """
+    Whether deleting the model needs the ORM unit of work, i.e. it has relationships with delete cascades
+    or whose dependent rows (one-to-many foreign keys, many-to-many association rows) the ORM maintains.
+    """
+    return any(
+        rel.cascade.delete or (rel.direction is not MANYTOONE and not rel.viewonly)
+        for rel in model.__mapper__.relationships
+    )
+
+
+@lru_cache(maxsize=1024)
+def _resolve_relationship_path(model: type[BaseSqlModel], path: str) -> tuple:
+    """
+    Resolve a (dotted) relationship path to the relationship attributes along it, e.g.
+    'run.hardware' -> (Model.run, Run.hardware). Cached per model and path.
+    """
+    current_model = model
+    relationships = []
+    for part in path.split('.'):
+        relationship = _get_relationship_map(current_model).get(part)
+        if relationship is None:
+            raise AttributeError(f"'{current_model.__name__}' has no relationship '{part}'")
+        attr, current_model = relationship
+        relationships.append(attr)
+    return tuple(relationships)
+
+
+def _encode_cursor(values: list) -> str:
+    """Encode the keyset values of the last row of a page as an opaque, url safe cursor."""
+    payload = json.dumps(values, default=lambda value: value.value if isinstance(value, Enum) else str(value))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid pagination cursor")
+    return values
+
+
+def _is_nullable(column) -> bool:
+    return column.expression.nullable
+
+
+def _keyset_after(column, descending: bool, value: Any):
+    """Rows whose column sorts after value in keyset order (NULLs last), or None if nothing sorts after it."""
+    if value is None:
+        return None
+    after = column < value if descending else column > value
+    return or_(after, column.is_(None)) if _is_nullable(column) else after
+
+
+def _keyset_equal(column, value: Any):
+    return column.is_(None) if value is None else column == value
+
+
+def _from_cursor_value(column, value: Any) -> Any:
+    """Convert a value decoded from a cursor (JSON) back to the python type of its column."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if value is None or isinstance(value, python_type):
+        return value
+    try:
+        if python_type in (datetime, date, time):
+            return python_type.fromisoformat(value)
+        return python_type(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def _has_database_default(column) -> bool:
+    """Whether the database generates the value of the column when an INSERT omits it."""
+    if column.default is not None:
+        # scalar and callable defaults are computed in python, SQL expression and sequence defaults by the database
+        return not (column.default.is_scalar or column.default.is_callable)
+    return column.server_default is not None or column is column.table.autoincrement_column
+
+
+def _copy_default(column):
+    """
+    The client side default of the column as a function without arguments, or None if COPY cannot compute it.
+    SQLAlchemy wraps default functions without arguments (functools.update_wrapper sets __wrapped__), other
+    default functions take the execution context of the INSERT, which only INSERT provides.
+    """
+    default = column.default
+    if default.is_scalar:
+        return lambda: default.arg
+    return getattr(default.arg, "__wrapped__", None)
+
+
+def _to_copy_text(value: Any) -> str:
+    """Encode a value for PostgreSQL COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return '\\\\x' + bytes(value).hex()
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
 
 class BaseSqlRepository(Generic[TModel]):
+    _model_type: type[BaseSqlModel] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # resolve the model type once per subclass rather than on every instantiation
+        model_type = cls._get_base_model_type()
+        if isinstance(model_type, type):
+            cls._model_type = model_type
+
     def __init__(self, db: Session):
-        self.model = self._get_base_model_type()
+        self.model = self._model_type
+        self._columns = _get_column_map(self.model)
         self._db = db
 
     @classmethod
-    def _get_base_model_type(cls) -> BaseSqlModel:
-        bases = cls.__orig_bases__
-        return get_args(bases[0])[0]
+    def _get_base_model_type(cls) -> type[BaseSqlModel] | None:
+        bases = getattr(cls, '__orig_bases__', ())
+        args = get_args(bases[0]) if bases else ()
+        return args[0] if args else None
 
     def exists(self, query_filter: dict) -> bool:
         """
@@ -31,43 +244,115 @@ class BaseSqlRepository(Generic[TModel]):
         :param query_filter: dictionary of key-value pairs
         :return: boolean indicating if at least one matching object exists
         """
-        model = self._db.query(self.model).get(query_filter)
-        return model is not None
-
-    def get_by_id(self, id: UUID) -> TModel:
+        conditions = []
+        for key, value in query_filter.items():
+            column = self._columns.get(key)
+            if column is None:
+                raise AttributeError(f"'{self.model.__name__}' has no attribute '{key}'")
+            conditions.append(column == value)
+
+        # SELECT 1 ... LIMIT 1, no row data is transferred or hydrated
+        stmt = select(literal(1)).select_from(self.model).where(*conditions).limit(1)
+        return self._db.execute(stmt).first() is not None
+
+    def get_by_id(self, id: UUID, load_options: list = None) -> TModel:
         """
         Retrieve a single object as specified by its primary key.
         :param id: The model's primary key (e.g., 'id')
+        :param load_options: Loader options applied to the query, e.g. [selectinload(Model.run).selectinload(Run.hardware)]
         :return: The model
         """
-        return self._db.query(self.model).get(id)
+        return self._db.get(self.model, id, options=load_options)
 
     def get_models_by_ids(self, ids: list[any]) -> list[TModel]:
         """
         Retrieve multiple objects as specified by their primary keys.
+        Models already loaded in the session are not queried again, the rest are loaded with batched IN queries.
         :param ids: a list of the model's primary keys (e.g., 'id')
-        :return: a list of the models
+        :return: a list of the models, in the order of the ids, each model once (as the IN query returns each row once)
         """
-        return self._db.query(self.model).filter(self.model.id.in_(ids)).all()
+        # duplicate ids would otherwise return the model repeatedly only when it is already loaded in the session
+        unique_ids = list(dict.fromkeys(ids))
+
+        # models already loaded in this session don't need to be queried again
+        models = []
+        missing_ids = []
+        for id in unique_ids:
+            model = self._db.identity_map.get(self._db.identity_key(self.model, id))
+            if model is not None and not inspect(model).expired:
+                models.append(model)
+            else:
+                missing_ids.append(id)
+
+        ids_iter = iter(missing_ids)
+        while batch := list(islice(ids_iter, IN_CLAUSE_BATCH_SIZE)):
+            models.extend(self._db.scalars(select(self.model).where(self.model.id.in_(batch))).all())
+
+        # return the models in the order of the requested ids
+        positions = {id: position for position, id in enumerate(unique_ids)}
+        models.sort(key=lambda model: positions.get(model.id, len(positions)))
+        return models
 
-    def get(self, query_filter: Dict[str, Any] = None, skip: int = 0, limit: int = 100) -> List[TModel]:
+    def get(
+            self,
+            query_filter: Dict[str, Any] = None,
+            skip: int = 0,
+            limit: int = 100,
+            load_options: list = None
+    ) -> List[TModel]:
         """
         Retrieve multiple objects based on query filters, skip, and limit.
         :param query_filter: Dictionary of key-value pairs for filtering the query
         :param skip: Number of records to skip
         :param limit: Maximum number of records to return
+        :param load_options: Loader options applied to the query, e.g. [selectinload(Model.run).selectinload(Run.hardware)]
+            to load relationships of all returned rows in one query instead of a lazy load per row.
+            raiseload('*') makes accidental lazy loads raise, which is useful in tests.
         :return: List of models
         """
-        query_filter = query_filter or {}
-        query = self._db.query(self.model)
-        if query_filter:
-            for key, value in query_filter.items():
-                if hasattr(self.model, key):
-                    query = query.filter(getattr(self.model, key) == value)
+        stmt = select(self.model).where(*self._filter_conditions(query_filter))
+        if load_options:
+            stmt = stmt.options(*load_options)
+        stmt = stmt.offset(skip).limit(limit)
+
+        return self._db.scalars(stmt).all()
+
+    def compile_lookup(self, *keys: str) -> Select:
+        """
+        Return the prepared select filtering on equality of the given fields, e.g. compile_lookup('name', 'status').
+        Execute it with a dict of parameters named after the fields; the statement is shared by all instances.
+        :param keys: The field names to filter on
+        :return: The select statement
+        """
+        return _build_lookup_stmt(self.model, keys)
 
-        query = query.offset(skip).limit(limit)
+    def lookup(self, **params: Any) -> List[TModel]:
+        """
+        Retrieve all objects whose fields equal the given values, e.g. lookup(name='foo', status='active').
+        Uses the prepared statement of compile_lookup for the given field names, for hot fixed-shape queries.
+        None values are rejected: the statement compares with =, which never matches NULL (use get for IS NULL).
+        :param params: Field names and values to filter on
+        :return: List of models
+        """
+        null_fields = [key for key, value in params.items() if value is None]
+        if null_fields:
+            raise ValueError(f"lookup cannot match None values, use get to filter on NULL: {', '.join(null_fields)}")
+        stmt = self.compile_lookup(*sorted(params))
+        return self._db.execute(stmt, params).scalars().all()
 
-        return query.all()
+    def iter_all(self, query_filter: Dict[str, Any] = None, batch_size: int = ITER_BATCH_SIZE) -> Iterator[List[TModel]]:
+        """
+        Iterate over all objects matching the query filters in batches, for scans over large tables.
+        Rows are streamed with a server side cursor where the driver supports it, so only one batch
+        of models is held in memory at a time. Consume the iterator before committing the session.
+        :param query_filter: Dictionary of key-value pairs for filtering the query
+        :param batch_size: Number of models fetched and yielded per batch
+        :return: Iterator over lists of models
+        """
+        stmt = select(self.model).where(*self._filter_conditions(query_filter))
+        stmt = stmt.execution_options(yield_per=batch_size, stream_results=True)
+        for partition in self._db.execute(stmt).scalars().partitions(batch_size):
+            yield list(partition)
 
     def get_paginated(
             self,
@@ -76,7 +361,12 @@ class BaseSqlRepository(Generic[TModel]):
             limit: int = None,
             order_by: List[str] = None,
             search_fields: List[str] = None,
-            search_text: str = None
+            search_text: str = None,
+            include_total: bool = True,
+            eager_load: List[str] = None,
+            cursor: str = None,
+            load_options: list = None,
+            load_option_paths: List[str] = None
     ) -> PaginatedList[TModel]:
         """
         Retrieve multiple objects based on query filters, skip, limit, order, and search.
@@ -86,21 +376,206 @@ class BaseSqlRepository(Generic[TModel]):
         :param order_by: List of field names to order by. Use '-' prefix for descending order.
         :param search_fields: List of string or text field names to search
         :param search_text: Text to search for in the specified fields
+        :param include_total: Whether to issue a count query when the total cannot be inferred from the fetched page.
+            When False, total is None in that case.
+        :param eager_load: Relationship names (dotted for nested relationships, e.g. 'run.hardware')
+            to load with the page using selectinload, avoiding a lazy load per returned row.
+        :param cursor: Use keyset pagination instead of skip: an empty string requests the first page, further pages
+            are requested with the next_cursor of the previous page. Pages are ordered by order_by followed by id,
+            skip is ignored and no total or page numbers are returned. Unlike skip, the cost does not grow with depth.
+            Rows with NULL order_by values come last, in either direction.
+        :param load_options: Loader options applied to the page query, e.g. [selectinload(Model.run)]
+        :param load_option_paths: Relationship paths (dotted for nested relationships) load_options set a loader for,
+            e.g. ['run'] for [selectinload(Model.run)]. The search does not eager load the searched relationships
+            on these paths, which would conflict with the caller's loader.
         :return: Paginated response of models
         """
-        query_filter = query_filter or {}
-        base_query = self._db.query(self.model)
+        caller_options = [self._selectin_load_option(field_name) for field_name in eager_load or []]
+        caller_options.extend(load_options or [])
+        loaded_paths = set()
+        for path in [*(eager_load or []), *(load_option_paths or [])]:
+            relationships = tuple(attr.property for attr in _resolve_relationship_path(self.model, path))
+            loaded_paths.update(relationships[:length] for length in range(1, len(relationships) + 1))
+        stmt, options = self._build_base_paginated_get_stmt(
+            query_filter=query_filter,
+            order_by=order_by if cursor is None else None,
+            search_fields=search_fields,
+            search_text=search_text,
+            loaded_paths=loaded_paths
+        )
+        options.extend(caller_options)
+
+        if cursor is not None:
+            return self._get_keyset_page(stmt, options, limit, order_by, cursor)
+
+        skip = skip or 0
+        paginated_stmt = stmt
+        if options:
+            paginated_stmt = paginated_stmt.options(*options)
+        if skip:
+            paginated_stmt = paginated_stmt.offset(skip)
+
+        # Fetch one extra row to determine whether another page exists without counting
+        if limit is not None:
+            paginated_stmt = paginated_stmt.limit(limit + 1)
+        rows = self._db.execute(paginated_stmt).scalars().all()
+        if limit is not None:
+            has_next = len(rows) > limit
+            data = rows[:limit]
+        else:
+            data = rows
+            has_next = False
+
+        # The total is known from the fetched rows unless there is a further page
+        # or the requested page starts past the last row
+        if not has_next and (data or skip == 0):
+            total = skip + len(data)
+        elif include_total:
+            total = self._db.execute(self._build_count_stmt(stmt)).scalar_one()
+        else:
+            total = None
+
+        # Calculate next_page and previous_page
+        if limit:
+            next_page = (skip + limit) // limit + 1 if has_next else None
+            previous_page = max((skip - limit) // limit + 1, 1) if skip > 0 else None
+        else:
+            next_page = None
+            previous_page = None
+
+        # Construct and return the PaginatedResponse
+        return PaginatedList[TModel](
+            total=total,
+            skip=skip,
+            limit=limit if limit is not None else len(data),
+            data=data,
+            next=next_page,
+            previous=previous_page
+        )
+
+    def _get_keyset_page(
+            self,
+            stmt: Select,
+            load_options: list,
+            limit: int | None,
+            order_by: List[str] | None,
+            cursor: str
+    ) -> PaginatedList[TModel]:
+        """Fetch the page following the cursor: WHERE (order columns, id) > (cursor values) ORDER BY order columns, id."""
+        keys = self._keyset_keys(order_by)
+        if cursor:
+            values = _decode_cursor(cursor)
+            if len(values) != len(keys):
+                raise ValueError("Invalid pagination cursor")
+            stmt = stmt.where(self._keyset_predicate(keys, values, self._db.get_bind().dialect))
+        stmt = stmt.order_by(*self._keyset_order_by(keys))
+
+        if load_options:
+            stmt = stmt.options(*load_options)
+        if limit is not None:
+            stmt = stmt.limit(limit + 1)
+        rows = self._db.execute(stmt).scalars().all()
+        has_next = limit is not None and len(rows) > limit
+        data = rows[:limit] if has_next else rows
+
+        next_cursor = None
+        if has_next:
+            last = data[-1]
+            next_cursor = _encode_cursor([getattr(last, column.key) for column, _ in keys])
+
+        return PaginatedList[TModel](
+            total=None,
+            skip=0,
+            limit=limit if limit is not None else len(data),
+            data=data,
+            next=None,
+            previous=None,
+            next_cursor=next_cursor
+        )
+
+    def _keyset_keys(self, order_by: List[str] | None) -> list[tuple[Any, bool]]:
+        """The (column, descending) keys of a keyset paginated query: the order_by fields, then id as a tie-breaker."""
+        keys = []
+        for field_name in order_by or []:
+            descending = field_name.startswith('-')
+            key = field_name[1:] if descending else field_name
+            column = self._columns.get(key)
+            if column is None:
+                raise AttributeError(f"'{self.model.__name__}' has no attribute '{key}'")
+            keys.append((column, descending))
+
+        if not any(column.key == "id" for column, _ in keys):
+            # follow the direction of the other keys so a single row comparison can be used
+            keys.append((self.model.id, keys[0][1] if keys else False))
+        return keys
+
+    @staticmethod
+    def _keyset_order_by(keys: list[tuple[Any, bool]]) -> list:
+        """
+        The order criteria of a keyset paginated query. NULLs of nullable columns sort last in either direction,
+        on every database (a CASE rather than NULLS LAST, which SQL Server does not support).
+        """
+        criteria = []
+        for column, descending in keys:
+            if _is_nullable(column):
+                criteria.append(case((column.is_(None), 1), else_=0))
+            criteria.append(column.desc() if descending else column.asc())
+        return criteria
+
+    @staticmethod
+    def _keyset_predicate(keys: list[tuple[Any, bool]], values: list, dialect):
+        """Rows after the cursor values in the order given by keys (see _keyset_order_by)."""
+        values = [_from_cursor_value(column, value) for (column, _), value in zip(keys, values)]
+
+        directions = {descending for _, descending in keys}
+        if (dialect.name in ROW_VALUE_DIALECTS and len(directions) == 1
+                and not any(_is_nullable(column) for column, _ in keys)):
+            # uniform direction: a row value comparison, which can use a composite index
+            columns = tuple_(*[column for column, _ in keys])
+            cursor_values = tuple_(*values)
+            return columns < cursor_values if directions.pop() else columns > cursor_values
+
+        # mixed directions, nullable columns or no row values: (a > :a) OR (a = :a AND b < :b) OR ...
+        # the id key is never NULL, so there is at least one condition
+        conditions = []
+        for i, (column, descending) in enumerate(keys):
+            after = _keyset_after(column, descending, values[i])
+            if after is None:
+                continue
+            equal_prefix = [_keyset_equal(prefix_column, value) for (prefix_column, _), value in zip(keys[:i], values)]
+            conditions.append(and_(*equal_prefix, after))
+        return or_(*conditions)
+
+    def _build_base_paginated_get_stmt(
+            self,
+            query_filter: Dict[str, Any] = None,
+            order_by: List[str] = None,
+            search_fields: List[str] = None,
+            search_text: str = None,
+            loaded_paths: set[tuple] = frozenset()
+    ) -> tuple[Select, list]:
+        """
+        Build the filtered, searched and ordered select statement used by get_paginated.
+        The statement returns each model row at most once.
+        :param loaded_paths: Relationship paths the caller passes loader options for, as tuples of relationship
+            properties including every prefix; the joins of the search do not populate these
+        :return: The statement and the loader options that populate the searched relationships on the returned models
+        """
+        # Apply query filters, in a single where() as each call copies the statement
+        stmt = select(self.model).where(*self._filter_conditions(query_filter))
 
-        # Apply query filters
-        if query_filter:
-            for key, value in query_filter.items():
-                if hasattr(self.model, key):
-                    base_query = base_query.filter(getattr(self.model, key) == value)
+        # common case, filters only: nothing is joined or ordered
+        if not (search_text and search_fields) and not order_by:
+            return stmt, []
+
+        load_options = []
 
         # Apply search filters
         if search_text and search_fields:
             search_conditions = []
-            joins_applied = set()
+            # the relationships to join in order (a relationship is joined once) and the join chain of each field
+            joins_applied = {}
+            field_joins = {}
             for field_name in search_fields:
                 column, joins = self._get_column_and_joins(self.model, field_name)
 
@@ -108,142 +583,365 @@ class BaseSqlRepository(Generic[TModel]):
                 if not isinstance(column.type, (String, Text)):
                     raise TypeError(f"Field '{field_name}' is not a string or text column")
 
-                search_conditions.append(column.ilike(f"%{search_text}%"))
-
+                search_conditions.append(self._search_expression(column, search_text))
+                joins_applied.update(dict.fromkeys(joins))
+                if joins:
+                    field_joins[joins] = None
+
+            # many-to-one joins match at most one row, only a collection join can repeat the model's row
+            joins_collection = any(join.property.uselist for join in joins_applied)
+            if joins_collection:
+                # match the model's rows by id in a subquery instead, rather than selecting DISTINCT rows: DISTINCT
+                # compares every column of the model, which is costly for wide rows and fails for json columns
+                matching_ids = select(self.model.id)
+                for join in joins_applied:
+                    matching_ids = matching_ids.join(join)
+                stmt = stmt.where(self.model.id.in_(matching_ids.where(or_(*search_conditions))))
+            else:
                 # Apply joins to the query
-                for join in joins:
-                    if join not in joins_applied:
-                        base_query = base_query.join(join)
-                        joins_applied.add(join)
+                for join in joins_applied:
+                    stmt = stmt.join(join)
+                stmt = stmt.where(or_(*search_conditions))
 
-            if search_conditions:
-                base_query = base_query.filter(or_(*search_conditions))
+            for joins in field_joins:
+                option = self._joined_load_option(joins, loaded_paths, joined=not joins_collection)
+                if option is not None:
+                    load_options.append(option)
 
         # Apply sorting if order_by is provided
         if order_by:
-            order_criteria = []
-            for field_name in order_by:
-                descending = False
-                if field_name.startswith('-'):
-                    descending = True
-                    field_name = field_name[1:]
-                if hasattr(self.model, field_name):
-                    field = getattr(self.model, field_name)
-                    if descending:
-                        order_criteria.append(field.desc())
-                    else:
-                        order_criteria.append(field.asc())
-                else:
-                    raise AttributeError(f"'{self.model.__name__}' has no attribute '{field_name}'")
-            if order_criteria:
-                base_query = base_query.order_by(*order_criteria)
-
-        # Calculate total number of items before pagination
-        total = base_query.count()
-
-        # Apply pagination if skip or limit is provided
-        if skip is not None:
-            base_query = base_query.offset(skip)
-        if limit is not None:
-            base_query = base_query.limit(limit)
+            stmt = stmt.order_by(*[_resolve_order_by(self.model, field_name) for field_name in order_by])
 
-        data = base_query.all()
+        return stmt, load_options
 
-        # Calculate next_page and previous_page
-        if limit is not None:
-            if skip is None:
-                skip = 0
-            if skip + limit < total:
-                next_page = (skip + limit) // limit + 1
-            else:
-                next_page = None
-            if skip > 0:
-                previous_page = max((skip - limit) // limit + 1, 1)
+    @staticmethod
+    def _joined_load_option(joins: tuple, loaded_paths: set[tuple] = frozenset(), joined: bool = True):
+        """
+        Loader option for a chain of searched relationships, so accessing them does not lazy load per row.
+        Many-to-one relationships joined to the statement are populated from the joined row (contains_eager).
+        From the first collection on, or when the relationships are not joined to the statement, selectinload is
+        used instead: the join is filtered by the search, so it would only hold the matching children.
+        The chain stops at the first relationship in loaded_paths: a second loader strategy for the same
+        relationship would conflict with the caller's option.
+        :return: The loader option, or None if there is nothing to load
+        """
+        option = None
+        use_join = joined
+        for depth, join in enumerate(joins, start=1):
+            if tuple(relationship.property for relationship in joins[:depth]) in loaded_paths:
+                break
+            use_join = use_join and not join.property.uselist
+            if use_join:
+                option = contains_eager(join) if option is None else option.contains_eager(join)
             else:
-                previous_page = None
-        else:
-            next_page = None
-            previous_page = None
-
-        # Construct and return the PaginatedResponse
-        return PaginatedList[TModel](
-            total=total,
-            skip=skip if skip is not None else 0,
-            limit=limit if limit is not None else total,
-            data=data,
-            next=next_page,
-            previous=previous_page
-        )
+                option = selectinload(join) if option is None else option.selectinload(join)
+        return option
+
+    def _selectin_load_option(self, field_name: str):
+        """selectinload option for a (dotted) relationship path, e.g. 'run.hardware'."""
+        option = None
+        for attr in _resolve_relationship_path(self.model, field_name):
+            option = selectinload(attr) if option is None else option.selectinload(attr)
+        return option
+
+    @staticmethod
+    def _build_count_stmt(stmt: Select) -> Select:
+        """
+        Build a count statement for a get_paginated statement. Ordering is dropped from the count.
+        The statement returns each model row at most once, so its rows are counted directly.
+        """
+        return stmt.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)
 
-    def create(self, model: TModel, defer_commit: bool = False) -> TModel:
+    def create(self, model: TModel, defer_commit: bool = False, refresh: bool = True) -> TModel:
         """
         Create a new model instance and add it to the database.
         :param model: The model instance to create
         :param defer_commit: Whether to defer the commit of the transaction
+        :param refresh: Whether to reload the model after commit (e.g. to pick up server defaults)
         :return: The created model instance
         """
         self._db.add(model)
-        self._handle_defer_commit_single_model(model, defer_commit)
+        self._handle_defer_commit_single_model(model, defer_commit, refresh)
 
         return model
 
-    def update(self, model: TModel, defer_commit: bool = False) -> TModel:
+    def bulk_create(self, models: List[TModel], defer_commit: bool = False) -> List[TModel]:
+        """
+        Add multiple new model instances to the database in a single transaction.
+        Instances are added with add_all so ORM events still fire, and are not refreshed after commit.
+        :param models: The model instances to create
+        :param defer_commit: Whether to defer the commit of the transaction
+        :return: The created model instances
+        """
+        self._db.add_all(models)
+        if defer_commit:
+            self._db.flush()
+        else:
+            self._db.commit()
+
+        return models
+
+    def create_many(
+            self,
+            models: List[TModel],
+            batch_size: int = INSERT_BATCH_SIZE,
+            defer_commit: bool = False,
+            use_copy: bool = False
+    ) -> None:
+        """
+        Insert multiple new model instances using batched INSERT statements (executemany / multi-row VALUES).
+        Faster than bulk_create for large inserts, but the instances are not added to the session:
+        unset attributes (e.g. a generated id) are filled in the database only and are not set on the instances.
+        :param models: The model instances to insert
+        :param batch_size: Number of rows per INSERT batch
+        :param defer_commit: Whether to defer the commit of the transaction
+        :param use_copy: On PostgreSQL (psycopg2), stream at least COPY_THRESHOLD models with COPY instead.
+            INSERT is still used when COPY cannot insert the same rows (see _copy_columns), e.g. for ARRAY
+            or JSON columns.
+        :return: None
+        """
+        copy_columns = None
+        if use_copy and len(models) >= COPY_THRESHOLD and self._supports_copy():
+            copy_columns = self._copy_columns(models)
+        if copy_columns is not None:
+            self._copy_models(models, copy_columns)
+            if not defer_commit:
+                self._db.commit()
+            return
+
+        column_keys = self._columns.keys()
+        rows = [
+            {key: value for key in column_keys if (value := getattr(model, key)) is not None}
+            for model in models
+        ]
+
+        # rows without a value for a column receive the column default
+        rows_iter = iter(rows)
+        while batch := list(islice(rows_iter, batch_size)):
+            self._db.execute(insert(self.model), batch)
+
+        if not defer_commit:
+            self._db.commit()
+
+    def _supports_copy(self) -> bool:
+        dialect = self._db.get_bind().dialect
+        return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+    def _copy_columns(self, models: List[TModel]) -> list[tuple[str, Any, Any]] | None:
+        """
+        The (attribute name, column, client side default function) of the columns to COPY the models with,
+        or None if COPY cannot insert the same rows as INSERT:
+        INSERT omits unset values, so the database generates them (server defaults, SQL expression and sequence
+        defaults, autoincrement). COPY can only omit whole columns: such a column is left out when no model sets it,
+        and COPY is not used when only some models do.
+        COPY is not used either for column types without a COPY text encoding (see _COPY_TEXT_TYPES), or for unset
+        columns whose default function takes the INSERT's execution context.
+        """
+        columns = []
+        for attr in self.model.__mapper__.column_attrs:
+            column = attr.columns[0]
+            unset_count = sum(1 for model in models if getattr(model, attr.key) is None)
+            if unset_count and _has_database_default(column):
+                if unset_count == len(models):
+                    continue
+                return None
+
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                return None
+            if not issubclass(python_type, _COPY_TEXT_TYPES):
+                return None
+
+            default = None
+            if unset_count and column.default is not None:
+                default = _copy_default(column)
+                if default is None:
+                    return None
+            columns.append((attr.key, column, default))
+        return columns
+
+    def _copy_models(self, models: List[TModel], copy_columns: list[tuple[str, Any, Any]]) -> None:
+        """Stream models into the model's table with COPY ... FROM STDIN (psycopg2)."""
+        dialect = self._db.get_bind().dialect
+        preparer = dialect.identifier_preparer
+
+        columns = [
+            (key, column, default, column.type.bind_processor(dialect)) for key, column, default in copy_columns
+        ]
+
+        buffer = io.StringIO()
+        for model in models:
+            values = []
+            for key, column, default, processor in columns:
+                value = getattr(model, key)
+                # COPY does not apply client side column defaults
+                if value is None and default is not None:
+                    value = default()
+                if value is not None and processor is not None:
+                    value = processor(value)
+                values.append(_to_copy_text(value))
+            buffer.write('\t'.join(values))
+            buffer.write('\n')
+        buffer.seek(0)
+
+        table_name = preparer.format_table(self.model.__table__)
+        column_names = ', '.join(preparer.quote(column.name) for _, column, _, _ in columns)
+        raw_connection = self._db.connection().connection
+        with raw_connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table_name} ({column_names}) FROM STDIN", buffer)
+
+    def update(self, model: TModel, defer_commit: bool = False, refresh: bool = True) -> TModel:
         """
         Update an existing model instance in the database.
+        Loaded (persistent or detached) instances are flushed as a single UPDATE of their changed columns.
+        A new (transient) instance with the id of an existing row updates that row with the attributes set on it
+        to values other than None, e.g. Model(id=id, **schema.model_dump()) keeps created_on and applies the
+        onupdate of updated_on. To set a column to NULL, update a loaded instance.
         :param model: The model instance to update
         :param defer_commit: Whether to defer the commit of the transaction
+        :param refresh: Whether to reload the model after commit (e.g. to pick up server defaults)
         :return: The updated model instance
         """
-        if model.id is None:
+        model_id = model.id
+        if model_id is None:
             raise ValueError(f"The id of the existing model ({self.model.__name__}) is required for update action")
 
-        if self.exists(model.id):
-            self._db.add(model)
-            self._handle_defer_commit_single_model(model, defer_commit)
+        if inspect(model).transient:
+            # a new instance carrying the id of an existing row: update the row with the attributes that were set
+            return self._update_from_transient(model, defer_commit, refresh)
+
+        # persistent / detached instances: the flush issues a single UPDATE of the changed columns
+        # and fails with StaleDataError if the row no longer exists
+        self._db.add(model)
+        try:
+            self._handle_defer_commit_single_model(model, defer_commit, refresh)
+        except StaleDataError as e:
+            self._db.rollback()
+            raise ValueError(f"Model of type {self.model.__name__} with id: {model_id} not found") from e
+
+        return model
+
+    def update_many(
+            self,
+            updates: List[Dict[str, Any]],
+            key: str = "id",
+            batch_size: int = INSERT_BATCH_SIZE,
+            defer_commit: bool = False
+    ) -> None:
+        """
+        Update multiple rows with one executemany UPDATE per batch, instead of an update() call per model.
+        Each dict holds the key field identifying the row and the fields to set on it; dicts in a batch should set
+        the same fields. Column onupdate defaults (e.g. updated_on) are applied, ORM events are not.
+        By id this is an ORM bulk UPDATE by primary key, which also updates instances loaded in the session.
+        By any other key the rows are updated in the database only.
+        :param updates: Dictionaries of field values, each including the key field
+        :param key: The field identifying the row to update
+        :param batch_size: Number of rows per UPDATE batch
+        :param defer_commit: Whether to defer the commit of the transaction
+        :return: None
+        """
+        if key == "id":
+            stmt = update(self.model)
+            params = updates
+        else:
+            column = self._columns.get(key)
+            if column is None:
+                raise AttributeError(f"'{self.model.__name__}' has no attribute '{key}'")
+            # a bulk UPDATE by primary key requires the primary key, match other keys through a bound parameter
+            stmt = update(self.model.__table__).where(column == bindparam("_update_key"))
+            params = [
+                {**{field: value for field, value in values.items() if field != key}, "_update_key": values[key]}
+                for values in updates
+            ]
+
+        params_iter = iter(params)
+        while batch := list(islice(params_iter, batch_size)):
+            self._db.execute(stmt, batch)
+
+        if not defer_commit:
+            self._db.commit()
+
+    def _update_from_transient(self, model: TModel, defer_commit: bool, refresh: bool) -> TModel:
+        state = inspect(model)
+        # None values are skipped, like unset attributes, so columns the caller didn't provide keep their value
+        values = {
+            key: value
+            for key in self._columns.keys()
+            if key != "id" and (value := state.dict.get(key)) is not None
+        }
 
-            return model
+        stmt = update(self.model).where(self.model.id == model.id).values(**values)
+        result = self._db.execute(stmt, execution_options={"synchronize_session": False})
+        if result.rowcount == 0:
+            raise ValueError(f"Model of type {self.model.__name__} with id: {model.id} not found")
 
-        raise ValueError(f"Model of type {self.model.__name__} with id: {model.id} not found")
+        if defer_commit:
+            self._db.flush()
+        else:
+            self._db.commit()
+
+        if refresh:
+            return self._db.get(self.model, model.id, populate_existing=True)
+        return model
 
-    def delete(self, id: UUID, defer_commit: bool = False) -> None:
+    def delete(self, id: UUID, defer_commit: bool = False, load_first: bool = False) -> None:
         """
         Delete a single object as specified by its primary key.
+        Issues a single DELETE statement unless the model has relationships the ORM must cascade to,
+        in which case the model is loaded and deleted through the session.
         :param id: The model's primary key (e.g., 'id')
         :param defer_commit: Whether to defer the commit of the transaction
+        :param load_first: Always load the model before deleting it (e.g. when before_delete listeners need the instance)
         :return: None
         """
-        model = self._db.query(self.model).get(id)
+        if load_first or _requires_orm_delete(self.model):
+            model = self._db.get(self.model, id)
+            if model is not None:
+                self._db.delete(model)
+        else:
+            self._db.execute(delete(self.model).where(self.model.id == id))
 
-        if model is not None:
-            self._db.delete(model)
         if not defer_commit:
             self._db.commit()
 
-    def _handle_defer_commit_single_model(self, model: TModel, defer_commit: bool) -> None:
+    def commit(self) -> None:
+        """Commit the session's transaction, e.g. after operations with defer_commit=True."""
+        self._db.commit()
+
+    def rollback(self) -> None:
+        """Roll back the session's transaction."""
+        self._db.rollback()
+
+    def _filter_conditions(self, query_filter: Dict[str, Any] | None) -> list:
+        """Equality conditions for the query filter, keys that are not columns of the model are ignored."""
+        conditions = []
+        for key, value in (query_filter or {}).items():
+            column = self._columns.get(key)
+            if column is not None:
+                conditions.append(column == value)
+        return conditions
+
+    def _search_expression(self, column, search_text: str):
+        """
+        Build the search condition applied to a single search field in get_paginated.
+        The default is a case-insensitive substring match (ILIKE '%text%'), which cannot use a B-tree index.
+        Subclasses backed by large tables should override this to use an indexed search, e.g. PostgreSQL
+        full text search: func.to_tsvector(column).op('@@')(func.plainto_tsquery(search_text))
+        or a pg_trgm index: column.op('%')(search_text)
+        :param column: The column being searched
+        :param search_text: Text to search for
+        :return: SQLAlchemy boolean expression
+        """
+        return column.ilike(f"%{search_text}%")
+
+    def _handle_defer_commit_single_model(self, model: TModel, defer_commit: bool, refresh: bool = True) -> None:
         if defer_commit:
             self._db.flush()
         else:
             self._db.commit()
-            self._db.refresh(model)
+            if refresh:
+                self._db.refresh(model)
 
     def _get_column_and_joins(self, model, field_name):
-        parts = field_name.split('.')
-        current_model = model
-        joins = []
-        column = None
-        for part in parts:
-            if hasattr(current_model, part):
-                attr = getattr(current_model, part)
-                prop = getattr(attr, 'property', None)
-                if isinstance(prop, RelationshipProperty):
-                    # It's a relationship
-                    current_model = prop.mapper.class_
-                    joins.append(attr)
-                else:
-                    # It's a column
-                    column = attr
-            else:
-                raise AttributeError(f"'{current_model.__name__}' has no attribute '{part}'")
-        if column is None:
-            raise AttributeError(f"Field '{field_name}' does not correspond to a valid column")
-        return column, joins
\ No newline at end of file
+        return _resolve_field_path(model, field_name)
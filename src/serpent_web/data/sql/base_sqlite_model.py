@@ -1,10 +1,11 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, event, String
+from sqlalchemy import Column, DateTime, String
 from sqlalchemy.orm import declared_attr, as_declarative
 
 from serpent_web.core.util.datetime_helpers import utc_now_time_aware
-from serpent_web.core.util.string_helpers import snake_to_camel, title_to_snake
+from serpent_web.core.util.string_helpers import title_to_snake
+from serpent_web.data.sql.sql_alchemy_helpers import BinaryUuid
 
 
 @as_declarative()
@@ -25,11 +26,13 @@ class BaseSqliteModel:
     def timestamp(self):  # alias
         return self.created_on
 
-    class Config:
-        alias_generator = snake_to_camel
 
+class BinaryUuidSqliteModel(BaseSqliteModel):
+    """
+    BaseSqliteModel with the id stored as a 16 byte binary UUID instead of 36 characters of text, returned as
+    uuid.UUID. Only for new databases: existing text ids cannot be read as binary UUIDs. Foreign keys to these
+    models should use the BinaryUuid type as well.
+    """
+    __abstract__ = True
 
-# Event listener to update `updated_on` before update
-@event.listens_for(BaseSqliteModel, 'before_update', propagate=True)
-def update_timestamp(mapper, connection, target):
-    target.updated_on = utc_now_time_aware()
+    id = Column(BinaryUuid, primary_key=True, default=uuid.uuid4)
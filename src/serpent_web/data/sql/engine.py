@@ -0,0 +1,65 @@
+from sqlalchemy import create_engine, Engine, NullPool, make_url
+
+
+def build_engine(
+        url: str,
+        *,
+        pool_size: int = 20,
+        max_overflow: int = 10,
+        pool_pre_ping: bool = True,
+        pool_recycle: int = 3600,
+        pool_timeout: int = 30,
+        statement_timeout_ms: int | None = 60000,
+        query_cache_size: int = 1200,
+        null_pool: bool = False,
+        **kwargs
+) -> Engine:
+    """
+    Create an engine with a connection pool sized for request path use, so repository operations reuse
+    open connections instead of paying the connect (TCP + TLS) handshake per request.
+    Only sync drivers are supported (e.g. postgresql+psycopg2), async drivers such as asyncpg need create_async_engine.
+    :param url: The database url
+    :param pool_size: Number of connections kept open in the pool
+    :param max_overflow: Number of additional connections opened under load beyond pool_size
+    :param pool_pre_ping: Test connections on checkout, replacing connections closed by the server
+    :param pool_recycle: Replace connections older than this many seconds (before server / proxy idle timeouts)
+    :param pool_timeout: Seconds to wait for a connection when the pool is exhausted
+    :param statement_timeout_ms: PostgreSQL statement_timeout for the engine's connections (set through the libpq
+        options connection parameter), None to disable
+    :param query_cache_size: Size of the engine's compiled SQL cache (default 500), shared across sessions
+    :param null_pool: Open a new connection per checkout and close it on release (NullPool) instead of pooling,
+        for serverless deployments where idle pooled connections outlive the instance. Pool arguments are ignored.
+    :param kwargs: Additional create_engine arguments (e.g. echo)
+    :return: The engine
+    """
+    database_url = make_url(url)
+    connect_args = dict(kwargs.pop("connect_args", {}))
+
+    if database_url.get_backend_name() == "sqlite":
+        # sqlite uses a single file / in memory connection per thread, pool sizing does not apply
+        connect_args.setdefault("check_same_thread", False)
+        return create_engine(database_url, connect_args=connect_args, query_cache_size=query_cache_size, **kwargs)
+
+    if statement_timeout_ms is not None and database_url.get_backend_name() == "postgresql":
+        connect_args["options"] = f"{connect_args.get('options', '')} -c statement_timeout={statement_timeout_ms}".strip()
+
+    if null_pool:
+        return create_engine(
+            database_url,
+            poolclass=NullPool,
+            query_cache_size=query_cache_size,
+            connect_args=connect_args,
+            **kwargs
+        )
+
+    return create_engine(
+        database_url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=pool_pre_ping,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+        query_cache_size=query_cache_size,
+        connect_args=connect_args,
+        **kwargs
+    )
@@ -15,11 +15,11 @@ def parse_pydantic_schema(schema):
             # one to many, many to many
             if isinstance(value, list) and len(value):
                 if is_pydantic(value[0]):
-                    parsed_schema[key] = [schema.Meta.orm_model(**schema.dict()) for schema in value]
+                    parsed_schema[key] = [schema.Meta.orm_model(**schema.model_dump()) for schema in value]
             else:
                 # one to one
                 if is_pydantic(value):
-                    parsed_schema[key] = value.Meta.orm_model(**value.dict())
+                    parsed_schema[key] = value.Meta.orm_model(**value.model_dump())
         except AttributeError:
             raise AttributeError("Found nested Pydantic model but Meta.orm_model was not specified.")
     return parsed_schema
\ No newline at end of file
@@ -1,7 +1,8 @@
+import uuid
 from enum import Enum
 
 
-from sqlalchemy.types import TypeDecorator, String
+from sqlalchemy.types import TypeDecorator, String, LargeBinary
 
 
 class StringEnum(TypeDecorator):
@@ -10,17 +11,46 @@ class StringEnum(TypeDecorator):
     def __init__(self, enum_type, *args, **kwargs):
         assert issubclass(enum_type, Enum), "enum_type must be an Enum type"
         self.enum_type = enum_type
+        # computed once per column type rather than per bound / loaded value
+        self._value_to_member = {e.value: e for e in enum_type}
+        self._valid_values = frozenset(self._value_to_member)
         super().__init__(*args, **kwargs)
 
     def process_bind_param(self, value, dialect):
         # If the value is an instance of the Enum, use its value
         if isinstance(value, Enum):
-            value = value.value
+            return value.value
         # Otherwise, ensure the value corresponds to one of the Enum's values
-        elif value not in [e.value for e in self.enum_type]:
+        if value not in self._valid_values:
             raise ValueError(f"Invalid value: {value}")
         return value
 
     def process_result_value(self, value, dialect):
         # Convert the stored value back to an Enum member for Python code
-        return self.enum_type(value)
+        member = self._value_to_member.get(value)
+        return member if member is not None else self.enum_type(value)
+
+
+class BinaryUuid(TypeDecorator):
+    """
+    UUID stored as its 16 byte binary form, for databases without a native UUID type (e.g. sqlite).
+    Accepts uuid.UUID or str values and returns uuid.UUID.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return uuid.UUID
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        return uuid.UUID(bytes=bytes(value))
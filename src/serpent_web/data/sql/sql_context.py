@@ -1,10 +1,12 @@
 import logging
+import threading
+from typing import Optional
 
-import xxhash
 from sqlalchemy import create_engine, Engine
 from sqlalchemy.orm import sessionmaker
 from pydantic_settings import BaseSettings
 
+from serpent_web.data.sql.engine import build_engine
 from serpent_web.data.sql.sql_database_type import DatabaseType
 
 _logger = logging.getLogger(__name__)
@@ -14,8 +16,25 @@ class SqliteSettings(BaseSettings):
     sqlite_url: str
 
 
+class SqlEngineSettings(BaseSettings):
+    """
+    Connection pool settings of the engines created by EngineFactory (sqlite excluded).
+    sql_null_pool: no pooling, for serverless deployments (the pool settings are then ignored)
+    sql_pool_pre_ping: test connections on checkout, by default enabled except for Databricks
+    sql_pool_recycle: keep below the server's idle connection timeout
+    """
+    sql_pool_size: int = 200  # 200 is max possible pool size
+    sql_max_overflow: int = 10
+    sql_pool_timeout: int = 30
+    sql_pool_recycle: int = 3600
+    sql_pool_pre_ping: Optional[bool] = None
+    sql_null_pool: bool = False
+
+
 class EngineFactory:
     _engine_instances = {}
+    # guards engine creation only, cached engines are read without locking
+    _lock = threading.Lock()
     echo = False
 
     # todo:
@@ -24,28 +43,27 @@ class EngineFactory:
     @classmethod
     def get_engine(cls, database_type: DatabaseType, database_url: str, database_name: str = None) -> Engine:
         database_unique_id = f"{database_type}-{database_name}"
-        if database_unique_id in cls._engine_instances:
-            return cls._engine_instances[database_unique_id]
+        engine = cls._engine_instances.get(database_unique_id)
+        if engine is not None:
+            return engine
 
-        else:
-            engine = cls._engine_strategy_map().get(database_type, None)(database_url)
+        create_engine_strategy = cls._engine_strategy_map().get(database_type, None)
+        if create_engine_strategy is None:
+            raise ValueError(f"database type {database_type} not supported")
 
+        with cls._lock:
+            # another thread may have created the engine while we waited on the lock
+            engine = cls._engine_instances.get(database_unique_id)
             if engine is None:
-                raise ValueError(f"database type {database_type} not supported")
-
-            cls._engine_instances[database_unique_id] = engine
-
-        return cls.get_engine(
-            database_type=database_type,
-            database_url=database_url,
-            database_name=database_name
-        )
+                engine = create_engine_strategy(database_url)
+                cls._engine_instances[database_unique_id] = engine
+        return engine
 
     @classmethod
     def _engine_strategy_map(cls):
         return {
             DatabaseType.SQLITE: cls.create_sql_lite_engine,
-            DatabaseType.DATABRICKS: cls.create_sql_engine,
+            DatabaseType.DATABRICKS: cls.create_databricks_engine,
             DatabaseType.POSTGRES: cls.create_sql_engine,
             DatabaseType.AZURESQL: cls.create_sql_engine
         }
@@ -58,23 +76,52 @@ class EngineFactory:
         )
 
     @classmethod
-    def create_sql_engine(cls, database_url: str) -> Engine:
-        return create_engine(
+    def create_sql_engine(cls, database_url: str, pool_pre_ping: bool = True) -> Engine:
+        settings = SqlEngineSettings()
+        if settings.sql_pool_pre_ping is not None:
+            pool_pre_ping = settings.sql_pool_pre_ping
+
+        return build_engine(
             database_url,
             echo=cls.echo,
-            pool_pre_ping=True,
-            pool_size=200,  # 200 is max possible pool size
-            pool_recycle=3600
+            pool_size=settings.sql_pool_size,
+            max_overflow=settings.sql_max_overflow,
+            pool_timeout=settings.sql_pool_timeout,
+            pool_recycle=settings.sql_pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            null_pool=settings.sql_null_pool,
+            statement_timeout_ms=None
         )
 
+    # no pre-ping by default: the extra round trip per checkout is expensive on the high latency Databricks
+    # connection, stale connections are replaced by pool_recycle instead
+    @classmethod
+    def create_databricks_engine(cls, database_url: str) -> Engine:
+        return cls.create_sql_engine(database_url, pool_pre_ping=False)
 
-def get_session(**kwargs):
+
+def _create_sessionmaker(**kwargs) -> sessionmaker:
     return sessionmaker(
         expire_on_commit=False,
         autocommit=False,
         autoflush=False,
         **kwargs
-    )()
+    )
+
+
+def get_session(**kwargs):
+    return _create_sessionmaker(**kwargs)()
+
+
+# engine -> sessionmaker, built once per engine rather than per request
+_sessionmakers: dict[Engine, sessionmaker] = {}
+
+
+def get_sessionmaker(engine: Engine) -> sessionmaker:
+    session_factory = _sessionmakers.get(engine)
+    if session_factory is None:
+        session_factory = _sessionmakers.setdefault(engine, _create_sessionmaker(bind=engine))
+    return session_factory
 
 
 class InternalError(Exception):
@@ -83,18 +130,18 @@ class InternalError(Exception):
 
 def db_dependency(database_type: DatabaseType, database_url: str, database_name: str = None) -> get_session:
     if database_name is None:
-        # unique key for engine instances dict
-        database_name = xxhash.xxh64(database_url).hexdigest()
+        # unique key for engine instances dict, the url is only used as a key and never logged
+        database_name = database_url
 
     def get_db():
         engine = EngineFactory.get_engine(database_type=database_type, database_url=database_url,
                                           database_name=database_name)
-        db = get_session(bind=engine)
+        db = get_sessionmaker(engine)()
         try:
             yield db
             db.commit()
         except InternalError as e:
-            _logger.exception(f'Database session rollback due to exception: {e}')
+            _logger.exception('Database session rollback due to exception: %s', e)
             db.rollback()
             raise e
         finally:
@@ -1,6 +1,7 @@
+from contextlib import contextmanager
 from uuid import UUID
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, List
+from typing import TypeVar, Generic, Iterator, List
 
 from serpent_web.data.data_schemas import PaginatedList
 from serpent_web.data.sql.base_sql_repository import BaseSqlRepository
@@ -16,6 +17,7 @@ class BaseManager(Generic[TModel], ABC):
     :type repository: BaseSqlRepository
     """
     _repository: BaseSqlRepository
+    _batch_depth: int = 0
 
     def __init__(self, repository: BaseSqlRepository):
         """
@@ -26,18 +28,48 @@ class BaseManager(Generic[TModel], ABC):
         """
         self._repository = repository
 
-    def get_by_id(self, id: UUID) -> TModel:
+    @contextmanager
+    def batch(self):
+        """
+        Group write operations into a single transaction: inside the block create, update and delete
+        calls only flush, and one commit is issued when the outermost batch exits.
+        The transaction is rolled back if the block raises.
+
+        Example::
+
+            with manager.batch():
+                for model in models:
+                    manager.update(model)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._repository.rollback()
+            raise
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self._repository.commit()
+
+    def _defer_commit(self, defer_commit: bool) -> bool:
+        return defer_commit or self._batch_depth > 0
+
+    def get_by_id(self, id: UUID, load_options: list = None) -> TModel:
         """
         Retrieve a model instance by its primary key.
 
         :param id: The primary key of the model instance.
         :type id: UUID
+        :param load_options: Loader options, e.g. [selectinload(Model.run).selectinload(Run.hardware)].
+        :type load_options: list, optional
         :return: The model instance corresponding to the given primary key.
         :rtype: TModel
         """
-        return self._repository.get_by_id(id)
+        return self._repository.get_by_id(id, load_options=load_options)
 
-    def create(self, model: TModel, defer_commit: bool = False) -> TModel:
+    def create(self, model: TModel, defer_commit: bool = False, refresh: bool = True) -> TModel:
         """
         Create a new model instance in the database.
 
@@ -45,12 +77,41 @@ class BaseManager(Generic[TModel], ABC):
         :type model: TModel
         :param defer_commit: Whether to defer the commit of the transaction.
         :type defer_commit: bool, optional
+        :param refresh: Whether to reload the model after commit.
+        :type refresh: bool, optional
         :return: The created model instance.
         :rtype: TModel
         """
-        return self._repository.create(model=model, defer_commit=defer_commit)
+        return self._repository.create(model=model, defer_commit=self._defer_commit(defer_commit), refresh=refresh)
+
+    def bulk_create(self, models: List[TModel], defer_commit: bool = False) -> List[TModel]:
+        """
+        Create multiple model instances in the database in a single transaction.
+
+        :param models: The model instances to create.
+        :type models: List[TModel]
+        :param defer_commit: Whether to defer the commit of the transaction.
+        :type defer_commit: bool, optional
+        :return: The created model instances.
+        :rtype: List[TModel]
+        """
+        return self._repository.bulk_create(models=models, defer_commit=self._defer_commit(defer_commit))
 
-    def update(self, model: TModel, defer_commit: bool = False) -> TModel:
+    def create_many(self, models: List[TModel], batch_size: int = 1000, defer_commit: bool = False) -> None:
+        """
+        Insert multiple model instances using batched INSERT statements.
+
+        :param models: The model instances to insert.
+        :type models: List[TModel]
+        :param batch_size: Number of rows per INSERT batch.
+        :type batch_size: int, optional
+        :param defer_commit: Whether to defer the commit of the transaction.
+        :type defer_commit: bool, optional
+        :return: None
+        """
+        self._repository.create_many(models=models, batch_size=batch_size, defer_commit=self._defer_commit(defer_commit))
+
+    def update(self, model: TModel, defer_commit: bool = False, refresh: bool = True) -> TModel:
         """
         Update an existing model instance in the database.
 
@@ -58,12 +119,36 @@ class BaseManager(Generic[TModel], ABC):
         :type model: TModel
         :param defer_commit: Whether to defer the commit of the transaction.
         :type defer_commit: bool, optional
+        :param refresh: Whether to reload the model after commit.
+        :type refresh: bool, optional
         :return: The updated model instance.
         :rtype: TModel
         """
-        return self._repository.update(model=model, defer_commit=defer_commit)
+        return self._repository.update(model=model, defer_commit=self._defer_commit(defer_commit), refresh=refresh)
 
-    def delete(self, id: UUID, defer_commit: bool = False) -> None:
+    def update_many(
+            self,
+            updates: List[dict[str, any]],
+            key: str = "id",
+            batch_size: int = 1000,
+            defer_commit: bool = False
+    ) -> None:
+        """
+        Update multiple rows using batched UPDATE statements.
+
+        :param updates: Dictionaries of field values, each including the key field.
+        :type updates: List[dict[str, any]]
+        :param key: The field identifying the row to update.
+        :type key: str, optional
+        :param batch_size: Number of rows per UPDATE batch.
+        :type batch_size: int, optional
+        :param defer_commit: Whether to defer the commit of the transaction.
+        :type defer_commit: bool, optional
+        :return: None
+        """
+        self._repository.update_many(updates=updates, key=key, batch_size=batch_size, defer_commit=self._defer_commit(defer_commit))
+
+    def delete(self, id: UUID, defer_commit: bool = False, load_first: bool = False) -> None:
         """
         Delete a model instance from the database by its primary key.
 
@@ -71,19 +156,47 @@ class BaseManager(Generic[TModel], ABC):
         :type id: UUID
         :param defer_commit: Whether to defer the commit of the transaction.
         :type defer_commit: bool, optional
+        :param load_first: Whether to always load the model instance before deleting it.
+        :type load_first: bool, optional
         :return: None
         """
-        self._repository.delete(id=id, defer_commit=defer_commit)
+        self._repository.delete(id=id, defer_commit=self._defer_commit(defer_commit), load_first=load_first)
 
-    def get(self, query_filter: dict[str, any] = None, skip: int = 0, limit: int = 100) -> list[TModel]:
+    def get(
+            self,
+            query_filter: dict[str, any] = None,
+            skip: int = 0,
+            limit: int = 100,
+            load_options: list = None
+    ) -> list[TModel]:
         """
         Retrieve multiple objects based on query filters, skip, and limit.
         :param query_filter: Dictionary of key-value pairs for filtering the query
         :param skip: Number of records to skip
         :param limit: Maximum number of records to return
+        :param load_options: Loader options, e.g. [selectinload(Model.run).selectinload(Run.hardware)] to load
+            relationships of all rows in one query. raiseload('*') makes accidental lazy loads raise in tests.
+        :return: List of models
+        """
+        return self._repository.get(query_filter=query_filter, skip=skip, limit=limit, load_options=load_options)
+
+    def iter_all(self, query_filter: dict[str, any] = None, batch_size: int = 1000) -> Iterator[List[TModel]]:
+        """
+        Iterate over all objects matching the query filters in batches.
+        :param query_filter: Dictionary of key-value pairs for filtering the query
+        :param batch_size: Number of models per batch
+        :return: Iterator over lists of models
+        """
+        return self._repository.iter_all(query_filter=query_filter, batch_size=batch_size)
+
+    def lookup(self, **params: any) -> List[TModel]:
+        """
+        Retrieve all objects whose fields equal the given values using a prepared statement.
+        None values are rejected with a ValueError, as the statement never matches NULL.
+        :param params: Field names and values to filter on
         :return: List of models
         """
-        return self._repository.get(query_filter=query_filter, skip=skip, limit=limit)
+        return self._repository.lookup(**params)
 
     def get_models_by_ids(self, ids: List[any]) -> List[TModel]:
         """
@@ -100,7 +213,12 @@ class BaseManager(Generic[TModel], ABC):
             limit: int = None,
             order_by: list[str] = None,
             search_fields: list[str] = None,
-            search_text: str = None
+            search_text: str = None,
+            include_total: bool = True,
+            eager_load: list[str] = None,
+            cursor: str = None,
+            load_options: list = None,
+            load_option_paths: list[str] = None
     ) -> PaginatedList[TModel]:
         """
         Retrieve multiple objects based on query filters, skip, and limit.
@@ -110,6 +228,11 @@ class BaseManager(Generic[TModel], ABC):
         :param order_by: List of field names to order by. Use '-' prefix for descending order.
         :param search_fields: List of string or text field names to search
         :param search_text: Text to search for in the specified fields
+        :param include_total: Whether to count the total when it cannot be inferred from the fetched page
+        :param eager_load: Relationship names (dotted for nested relationships) to load with the page
+        :param cursor: Keyset pagination cursor, an empty string for the first page or the next_cursor of the previous page
+        :param load_options: Loader options applied to the page query
+        :param load_option_paths: Relationship paths (dotted for nested relationships) load_options set a loader for
         :return: List of models
         """
         return self._repository.get_paginated(
@@ -118,5 +241,10 @@ class BaseManager(Generic[TModel], ABC):
             limit=limit,
             order_by=order_by,
             search_fields=search_fields,
-            search_text=search_text
+            search_text=search_text,
+            include_total=include_total,
+            eager_load=eager_load,
+            cursor=cursor,
+            load_options=load_options,
+            load_option_paths=load_option_paths
         )
@@ -0,0 +1,275 @@
+import base64
+import unittest
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, ForeignKey, Integer, String, Uuid, create_engine, event
+from sqlalchemy.dialects import mssql, sqlite
+from sqlalchemy.orm import Session, relationship, selectinload
+
+from serpent_web.data.sql.base_sql_model import BaseSqlModel
+from serpent_web.data.sql.base_sql_repository import BaseSqlRepository
+
+
+class UuidSqlModel(BaseSqlModel[uuid.UUID]):
+    __abstract__ = True
+
+    @classmethod
+    def id_model_type(cls):
+        return Uuid
+
+    @classmethod
+    def default_id(cls):
+        return uuid.uuid4
+
+
+class Owner(UuidSqlModel):
+    name = Column(String)
+    pets = relationship("Pet", back_populates="owner")
+
+
+class Pet(UuidSqlModel):
+    name = Column(String, nullable=False)
+    age = Column(Integer)
+    owner_id = Column(ForeignKey("owner.id"))
+    owner = relationship(Owner, back_populates="pets")
+
+
+class OwnerRepository(BaseSqlRepository[Owner]):
+    pass
+
+
+class PetRepository(BaseSqlRepository[Pet]):
+    pass
+
+
+class SqlRepositoryTestCase(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        BaseSqlModel.metadata.create_all(engine)
+        self.db = Session(engine, expire_on_commit=False)
+        self.addCleanup(engine.dispose)
+        self.addCleanup(self.db.close)
+        self.owners = OwnerRepository(self.db)
+        self.pets = PetRepository(self.db)
+
+        self.statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: self.statements.append(args[2]))
+
+    def create_pets(self, *ages: int | None, owner: Owner = None) -> list[Pet]:
+        """Pets named pet-0, pet-1, ... with the given ages, created one minute apart."""
+        created_on = datetime(2024, 1, 1)
+        pets = [
+            Pet(name=f"pet-{i}", age=age, owner=owner, created_on=created_on + timedelta(minutes=i))
+            for i, age in enumerate(ages)
+        ]
+        self.pets.bulk_create(pets)
+        self.db.expunge_all()
+        self.statements.clear()
+        return pets
+
+
+class GetPaginatedTests(SqlRepositoryTestCase):
+    def test_get_paginated_should_count_when_there_is_a_next_page(self):
+        self.create_pets(1, 2, 3, 4, 5)
+
+        page = self.pets.get_paginated(limit=2, order_by=["age"])
+
+        self.assertEqual([pet.age for pet in page.data], [1, 2])
+        self.assertEqual((page.total, page.next, page.previous), (5, 2, None))
+        self.assertEqual(len(self.statements), 2)
+
+    def test_get_paginated_should_infer_the_total_on_the_last_page(self):
+        self.create_pets(1, 2, 3, 4, 5)
+
+        page = self.pets.get_paginated(skip=4, limit=2, order_by=["age"])
+
+        self.assertEqual([pet.age for pet in page.data], [5])
+        self.assertEqual((page.total, page.next, page.previous), (5, None, 2))
+        self.assertEqual(len(self.statements), 1)
+
+    def test_get_paginated_should_count_when_skipping_past_the_last_row(self):
+        self.create_pets(1, 2)
+
+        page = self.pets.get_paginated(skip=10, limit=2)
+
+        self.assertEqual((page.data, page.total, page.next), ([], 2, None))
+
+    def test_get_paginated_should_not_count_without_include_total(self):
+        self.create_pets(1, 2, 3)
+
+        page = self.pets.get_paginated(limit=2, include_total=False)
+
+        self.assertEqual((len(page.data), page.total, page.next), (2, None, 2))
+        self.assertEqual(len(self.statements), 1)
+
+    def test_get_paginated_should_return_each_row_once_when_searching_a_collection(self):
+        bob = Owner(name="bob")
+        self.create_pets(1, 2, 3, owner=bob)
+        self.create_pets(4, owner=Owner(name="al"))
+
+        page = self.owners.get_paginated(search_fields=["pets.name"], search_text="pet", limit=1, order_by=["name"])
+
+        self.assertEqual([owner.name for owner in page.data], ["al"])
+        self.assertEqual((page.total, page.next), (2, 2))
+        self.assertNotIn("DISTINCT", " ".join(self.statements))
+
+    def test_get_paginated_should_apply_caller_loader_options_to_searched_relationships(self):
+        self.create_pets(1, owner=Owner(name="bob"))
+        self.create_pets(2, owner=Owner(name="al"))
+
+        for options in (
+            {"eager_load": ["owner"]},
+            {"load_options": [selectinload(Pet.owner)], "load_option_paths": ["owner"]},
+        ):
+            with self.subTest(**options):
+                page = self.pets.get_paginated(search_fields=["owner.name"], search_text="bo", **options)
+
+                self.assertEqual([(pet.age, pet.owner.name) for pet in page.data], [(1, "bob")])
+                self.db.expunge_all()
+
+
+class KeysetPaginationTests(SqlRepositoryTestCase):
+    def get_all_pages(self, order_by: list[str] = None, limit: int = 2) -> list[Pet]:
+        pets = []
+        cursor = ""
+        while cursor is not None:
+            page = self.pets.get_paginated(limit=limit, order_by=order_by, cursor=cursor)
+            self.assertLessEqual(len(page.data), limit)
+            pets.extend(page.data)
+            cursor = page.next_cursor
+        return pets
+
+    def test_cursor_pages_should_follow_a_uniform_order(self):
+        self.create_pets(3, 1, 2, 2, 5)
+
+        self.assertEqual([pet.age for pet in self.get_all_pages(["name"])], [3, 1, 2, 2, 5])
+        self.assertEqual([pet.age for pet in self.get_all_pages(["-name"])], [5, 2, 2, 1, 3])
+
+    def test_cursor_pages_should_follow_a_mixed_order(self):
+        pets = self.create_pets(1, 2, 2, 1, 3)
+
+        names = [pet.name for pet in self.get_all_pages(["-age", "name"])]
+
+        self.assertEqual(names, [pets[i].name for i in (4, 1, 2, 0, 3)])
+
+    def test_cursor_pages_should_include_null_values_last(self):
+        pets = self.create_pets(2, None, 1, None, 3)
+
+        ascending = [pet.name for pet in self.get_all_pages(["age", "name"])]
+        descending = [pet.name for pet in self.get_all_pages(["-age"], limit=1)]
+
+        self.assertEqual(ascending, [pets[i].name for i in (2, 0, 4, 1, 3)])
+        self.assertEqual(descending[:3], [pets[i].name for i in (4, 0, 2)])
+        self.assertCountEqual(descending[3:], [pets[1].name, pets[3].name])
+
+    def test_cursor_pages_should_order_by_a_timestamp(self):
+        pets = self.create_pets(1, 2, 3, 4, 5)
+
+        names = [pet.name for pet in self.get_all_pages(["-created_on"])]
+
+        self.assertEqual(names, [pet.name for pet in reversed(pets)])
+
+    def test_cursor_pages_should_order_by_id_by_default(self):
+        pets = self.create_pets(1, 2, 3, 4, 5)
+
+        ids = [pet.id for pet in self.get_all_pages()]
+
+        self.assertEqual(ids, sorted(pet.id for pet in pets))
+
+    def test_keyset_predicate_should_compare_row_values_only_where_supported(self):
+        keys = self.pets._keyset_keys(["name"])
+        values = ["pet-1", str(uuid.uuid4())]
+
+        for dialect, row_values in ((sqlite.dialect(), True), (mssql.dialect(), False)):
+            with self.subTest(dialect=dialect.name):
+                sql = str(self.pets._keyset_predicate(keys, values, dialect).compile(dialect=dialect))
+
+                self.assertEqual("(pet.name, pet.id) >" in sql, row_values, sql)
+
+    def test_get_paginated_should_reject_a_tampered_cursor(self):
+        self.create_pets(1, 2, 3)
+        next_cursor = self.pets.get_paginated(limit=1, order_by=["created_on"], cursor="").next_cursor
+        tampered_cursors = [
+            "not a cursor",
+            next_cursor[:-4],
+            base64.urlsafe_b64encode(b'["2024-01-01T00:00:00"]').decode(),
+            base64.urlsafe_b64encode(b'["yesterday", "not-a-uuid"]').decode(),
+            base64.urlsafe_b64encode(b'[{}, {}]').decode(),
+        ]
+
+        for cursor in tampered_cursors:
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                self.pets.get_paginated(limit=1, order_by=["created_on"], cursor=cursor)
+
+
+class GetModelsByIdsTests(SqlRepositoryTestCase):
+    def test_get_models_by_ids_should_return_each_model_once_in_the_order_of_the_ids(self):
+        first, second = self.create_pets(1, 2)
+        ids = [second.id, first.id, second.id]
+
+        queried = self.pets.get_models_by_ids(ids)
+        loaded = self.pets.get_models_by_ids(ids)
+
+        self.assertEqual([pet.id for pet in queried], [second.id, first.id])
+        self.assertEqual([pet.id for pet in loaded], [second.id, first.id])
+
+
+class LookupTests(SqlRepositoryTestCase):
+    def test_lookup_should_return_the_models_with_the_given_values(self):
+        self.create_pets(1, 2, 2)
+
+        self.assertEqual(sorted(pet.name for pet in self.pets.lookup(age=2)), ["pet-1", "pet-2"])
+
+    def test_lookup_should_reject_none_values(self):
+        self.create_pets(None)
+
+        with self.assertRaises(ValueError):
+            self.pets.lookup(name="pet-0", age=None)
+
+
+class UpdateManyTests(SqlRepositoryTestCase):
+    def test_update_many_should_update_the_rows_by_id(self):
+        first, second = self.create_pets(1, 2)
+
+        self.pets.update_many([{"id": first.id, "age": 10}, {"id": second.id, "age": 20}])
+
+        self.assertEqual(sorted(pet.age for pet in self.pets.get()), [10, 20])
+
+    def test_update_many_should_update_the_rows_by_another_key(self):
+        self.create_pets(1, 2)
+
+        self.pets.update_many([{"name": "pet-0", "age": 10}, {"name": "pet-1", "age": 20}], key="name")
+
+        self.assertEqual({pet.name: pet.age for pet in self.pets.get()}, {"pet-0": 10, "pet-1": 20})
+
+
+class CreateManyTests(SqlRepositoryTestCase):
+    def test_create_many_should_apply_the_column_defaults(self):
+        self.pets.create_many([Pet(name="rex"), Pet(name="fido", age=2)])
+
+        pets = self.pets.get()
+
+        self.assertEqual(sorted(pet.name for pet in pets), ["fido", "rex"])
+        self.assertTrue(all(pet.id is not None and pet.created_on is not None for pet in pets))
+
+
+class UpdateTests(SqlRepositoryTestCase):
+    def test_update_should_keep_the_columns_a_new_instance_sets_to_none(self):
+        pet = self.pets.create(Pet(name="rex", age=3))
+        self.db.expunge_all()
+
+        updated = self.pets.update(Pet(id=pet.id, name="fido", age=None, created_on=None, updated_on=None))
+
+        self.assertEqual(updated.name, "fido")
+        self.assertEqual(updated.age, 3)
+        self.assertEqual(updated.created_on, pet.created_on)
+        self.assertIsNotNone(updated.updated_on)
+
+    def test_update_should_raise_for_a_new_instance_without_an_existing_row(self):
+        with self.assertRaises(ValueError):
+            self.pets.update(Pet(id=uuid.uuid4(), name="rex"))
+
+
+if __name__ == '__main__':
+    unittest.main()
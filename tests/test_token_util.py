@@ -0,0 +1,174 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from starlette.exceptions import HTTPException
+
+from serpent_web.core.authentication.oauth20 import token_util
+
+JWKS_URL = "https://login.example.com/keys"
+AUDIENCE = "api://serpent"
+KID = "key-1"
+
+
+def _generate_private_key() -> str:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    ).decode()
+
+
+PRIVATE_KEY = _generate_private_key()
+PUBLIC_JWK = {**jwk.construct(PRIVATE_KEY, token_util.RSAA).public_key().to_dict(), "kid": KID}
+
+
+def _encode_token(expires_in: int = 300, kid: str | None = KID, **claims) -> str:
+    payload = {"sub": "user-1", "aud": AUDIENCE, "exp": int(time.time()) + expires_in, **claims}
+    headers = {"kid": kid} if kid is not None else None
+    return jwt.encode(payload, PRIVATE_KEY, algorithm=token_util.RSAA, headers=headers)
+
+
+class TokenUtilTestCase(unittest.TestCase):
+    def setUp(self):
+        token_util.invalidate_jwks()
+        token_util._verify_cache.clear()
+        fetch_patcher = mock.patch.object(token_util, "_fetch_jwks_keys", return_value={KID: PUBLIC_JWK})
+        self.fetch_jwks_keys = fetch_patcher.start()
+        self.addCleanup(fetch_patcher.stop)
+        self.addCleanup(token_util.invalidate_jwks)
+
+
+class VerifyTokenTests(TokenUtilTestCase):
+    def test_verify_token_should_return_the_payload_of_a_valid_token(self):
+        payload = token_util.verify_token(_encode_token(), JWKS_URL, AUDIENCE)
+
+        self.assertEqual(payload["sub"], "user-1")
+
+    def test_verify_token_should_reject_an_expired_token(self):
+        with self.assertRaises(HTTPException) as context:
+            token_util.verify_token(_encode_token(expires_in=-60), JWKS_URL, AUDIENCE)
+
+        self.assertEqual(context.exception.status_code, 403)
+
+    def test_verify_token_should_reject_an_expired_token_when_the_verify_cache_is_enabled(self):
+        with mock.patch.object(token_util.token_settings, "token_verify_cache_enabled", True):
+            with self.assertRaises(HTTPException) as context:
+                token_util.verify_token(_encode_token(expires_in=-60), JWKS_URL, AUDIENCE)
+
+        self.assertEqual(context.exception.status_code, 403)
+
+    def test_verify_token_should_decode_the_token_header_once(self):
+        with mock.patch.object(token_util, "_peek_header", wraps=token_util._peek_header) as peek_header, \
+                mock.patch.object(token_util.jwt, "get_unverified_header") as get_unverified_header:
+            for _ in range(2):
+                token_util.verify_token(_encode_token(), JWKS_URL, AUDIENCE)
+
+        self.assertEqual(peek_header.call_count, 2)
+        get_unverified_header.assert_not_called()
+
+    def test_verify_token_should_reuse_the_verified_payload_when_the_verify_cache_is_enabled(self):
+        token = _encode_token()
+
+        with mock.patch.object(token_util.token_settings, "token_verify_cache_enabled", True), \
+                mock.patch.object(token_util, "_decode_token", wraps=token_util._decode_token) as decode_token:
+            first = token_util.verify_token(token, JWKS_URL, AUDIENCE)
+            second = token_util.verify_token(token, JWKS_URL, AUDIENCE)
+
+        self.assertEqual(first, second)
+        self.assertEqual(decode_token.call_count, 1)
+
+    def test_verify_token_should_construct_the_verification_key_once_per_key_id(self):
+        tokens = [_encode_token(jti=str(i)) for i in range(3)]
+
+        with mock.patch.object(token_util.jwk, "construct", wraps=token_util.jwk.construct) as construct:
+            for token in tokens:
+                token_util.verify_token(token, JWKS_URL, AUDIENCE)
+
+        self.assertEqual(construct.call_count, 1)
+
+
+class GetJwksKeysTests(TokenUtilTestCase):
+    def test_get_jwks_keys_should_fetch_once_for_concurrent_requests(self):
+        def slow_fetch(jwks_url):
+            time.sleep(0.1)
+            return {KID: PUBLIC_JWK}
+        self.fetch_jwks_keys.side_effect = slow_fetch
+
+        threads = [threading.Thread(target=token_util.get_jwks_keys, args=(JWKS_URL,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.fetch_jwks_keys.call_count, 1)
+
+    def test_get_jwks_keys_should_return_the_expired_keys_when_the_refetch_fails(self):
+        keys = token_util.get_jwks_keys(JWKS_URL)
+        token_util._jwks_cache[JWKS_URL] = (keys, time.monotonic() - 1)
+        self.fetch_jwks_keys.side_effect = HTTPException(status_code=500)
+
+        with mock.patch.object(token_util, "JWKS_MIN_REFETCH_INTERVAL_SECONDS", 0):
+            self.assertIs(token_util.get_jwks_keys(JWKS_URL), keys)
+
+    def test_get_jwks_keys_should_refresh_keys_about_to_expire_in_the_background(self):
+        keys = token_util.get_jwks_keys(JWKS_URL)
+        token_util._jwks_cache[JWKS_URL] = (keys, time.monotonic() + 1)
+        refreshed = threading.Event()
+
+        def slow_fetch(jwks_url):
+            refreshed.wait(1)
+            return {KID: PUBLIC_JWK}
+        self.fetch_jwks_keys.side_effect = slow_fetch
+
+        with mock.patch.object(token_util, "JWKS_MIN_REFETCH_INTERVAL_SECONDS", 0):
+            # served from the cache while the refresh waits on the fetch
+            self.assertIs(token_util.get_jwks_keys(JWKS_URL), keys)
+            self.assertIs(token_util.get_jwks_keys(JWKS_URL), keys)
+            refreshed.set()
+            for _ in range(100):
+                if token_util._jwks_cache[JWKS_URL][0] is not keys:
+                    break
+                time.sleep(0.01)
+
+        self.assertIsNot(token_util._jwks_cache[JWKS_URL][0], keys)
+        self.assertEqual(self.fetch_jwks_keys.call_count, 2)
+
+
+class GetPublicKeyTests(TokenUtilTestCase):
+    def test_get_public_key_should_reject_a_token_without_a_key_id_without_fetching_the_jwks(self):
+        with self.assertRaises(HTTPException) as context:
+            token_util.get_public_key(_encode_token(kid=None), JWKS_URL)
+
+        self.assertEqual(context.exception.status_code, 403)
+        self.fetch_jwks_keys.assert_not_called()
+
+    def test_get_public_key_should_not_refetch_the_jwks_for_each_unknown_key_id(self):
+        token_util.verify_token(_encode_token(), JWKS_URL, AUDIENCE)
+
+        for _ in range(5):
+            with self.assertRaises(HTTPException) as context:
+                token_util.get_public_key(_encode_token(kid="forged"), JWKS_URL)
+            self.assertEqual(context.exception.status_code, 403)
+
+        self.assertEqual(self.fetch_jwks_keys.call_count, 1)
+
+    def test_get_public_key_should_refetch_the_jwks_once_for_a_rotated_key(self):
+        token_util.get_public_key(_encode_token(), JWKS_URL)
+        rotated_jwk = {**PUBLIC_JWK, "kid": "key-2"}
+        self.fetch_jwks_keys.return_value = {KID: PUBLIC_JWK, "key-2": rotated_jwk}
+
+        with mock.patch.object(token_util, "JWKS_MIN_REFETCH_INTERVAL_SECONDS", 0):
+            public_key = token_util.get_public_key(_encode_token(kid="key-2"), JWKS_URL)
+
+        self.assertEqual(public_key, rotated_jwk)
+        self.assertEqual(self.fetch_jwks_keys.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()